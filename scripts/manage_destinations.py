@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import re
 from collections import defaultdict
@@ -95,7 +96,7 @@ def _choose_candidate(destination_entry: dict[str, object], payload: dict[str, o
     return best_candidate if score > 0 else None
 
 
-def _hydrate_destinations(
+async def _hydrate_destinations(
     entries: Iterable[dict[str, object]],
     *,
     limit: int | None,
@@ -105,65 +106,68 @@ def _hydrate_destinations(
     updates: list[str] = []
     misses: list[str] = []
 
-    with LocationClient() as client:
-        processed = 0
-        for entry in entries:
-            if limit is not None and processed >= limit:
-                break
-
-            location_id = entry.get("location_id")
-            latitude = entry.get("latitude")
-            longitude = entry.get("longitude")
-            needs_update = (
-                overwrite
-                or not location_id
-                or latitude in (None, "")
-                or longitude in (None, "")
-            )
-
-            if not needs_update:
-                continue
+    pending = [
+        entry
+        for entry in entries
+        if overwrite
+        or not entry.get("location_id")
+        or entry.get("latitude") in (None, "")
+        or entry.get("longitude") in (None, "")
+    ]
 
-            query = str(entry["name"])
-            payload = client.lookup_best(query)
-            if not payload:
-                misses.append(f"{entry['key']}: no response for query '{query}'")
-                continue
-
-            entry["_country_hint"] = _destination_country_hint(
-                Destination(
-                    key=str(entry["key"]),
-                    group=str(entry.get("group", "")),
-                    name=str(entry["name"]),
+    async with LocationClient() as client:
+        processed = 0
+        cursor = 0
+        while cursor < len(pending) and (limit is None or processed < limit):
+            # Look up only as many entries as the remaining limit allows, concurrently.
+            batch_size = len(pending) - cursor if limit is None else limit - processed
+            batch = pending[cursor : cursor + batch_size]
+            cursor += len(batch)
+            payloads = await client.lookup_many([str(entry["name"]) for entry in batch])
+
+            for entry, payload in zip(batch, payloads, strict=True):
+                location_id = entry.get("location_id")
+                query = str(entry["name"])
+                if not payload:
+                    misses.append(f"{entry['key']}: no response for query '{query}'")
+                    continue
+
+                entry["_country_hint"] = _destination_country_hint(
+                    Destination(
+                        key=str(entry["key"]),
+                        group=str(entry.get("group", "")),
+                        name=str(entry["name"]),
+                    )
                 )
-            )
 
-            candidate = _choose_candidate(entry, payload)
-            if not candidate:
-                misses.append(f"{entry['key']}: no candidate matched query '{query}'")
-                continue
-
-            geo = candidate.get("geoLocation") or {}
-            new_location_id = candidate.get("id")
-            new_latitude = geo.get("latitude")
-            new_longitude = geo.get("longitude")
-
-            if not (new_location_id and new_latitude is not None and new_longitude is not None):
-                misses.append(f"{entry['key']}: candidate missing geo/location data")
-                continue
-
-            processed += 1
-            updates.append(
-                f"{entry['key']}: {location_id or '∅'} -> {new_location_id} "
-                f"({new_latitude}, {new_longitude}) [{candidate.get('_category')}]"
-            )
+                candidate = _choose_candidate(entry, payload)
+                if not candidate:
+                    misses.append(f"{entry['key']}: no candidate matched query '{query}'")
+                    continue
+
+                geo = candidate.get("geoLocation") or {}
+                new_location_id = candidate.get("id")
+                new_latitude = geo.get("latitude")
+                new_longitude = geo.get("longitude")
+
+                if not (
+                    new_location_id and new_latitude is not None and new_longitude is not None
+                ):
+                    misses.append(f"{entry['key']}: candidate missing geo/location data")
+                    continue
+
+                processed += 1
+                updates.append(
+                    f"{entry['key']}: {location_id or '∅'} -> {new_location_id} "
+                    f"({new_latitude}, {new_longitude}) [{candidate.get('_category')}]"
+                )
 
-            if dry_run:
-                continue
+                if dry_run:
+                    continue
 
-            entry["location_id"] = new_location_id
-            entry["latitude"] = float(new_latitude)
-            entry["longitude"] = float(new_longitude)
+                entry["location_id"] = new_location_id
+                entry["latitude"] = float(new_latitude)
+                entry["longitude"] = float(new_longitude)
 
         for entry in entries:
             entry.pop("_country_hint", None)
@@ -212,11 +216,13 @@ def main() -> None:
     entries: list[dict[str, object]] = catalog_data.get("destinations", [])
 
     if args.hydrate_missing:
-        updates, misses = _hydrate_destinations(
-            entries,
-            limit=args.hydrate_limit,
-            overwrite=args.hydrate_overwrite,
-            dry_run=args.dry_run,
+        updates, misses = asyncio.run(
+            _hydrate_destinations(
+                entries,
+                limit=args.hydrate_limit,
+                overwrite=args.hydrate_overwrite,
+                dry_run=args.dry_run,
+            )
         )
         if updates:
             print("Hydration updates:")
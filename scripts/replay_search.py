@@ -3,16 +3,19 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
 from pathlib import Path
 
 from playwright.async_api import async_playwright
 
+from secure_scraper.utils.serialization import dumps_bytes, dumps_pretty, loads
+
 DEFAULT_STORAGE = Path("data/logs/network/storage_state_20251030-171859.json")
 PROPERTIES_URL = "https://www.travel.americanexpress.com/en-us/book/api/lxp/hotel/properties"
 
 
-async def fetch_properties(storage: Path, payload_path: Path | None, output: Path, headless: bool) -> None:
+async def fetch_properties(
+    storage: Path, payload_path: Path | None, output: Path, headless: bool, *, pretty: bool = False
+) -> None:
     body = {
         "pagination": {"page": 1, "pageSize": 50},
         "sortOptions": [{"direction": "DESC", "option": "RECOMMENDED"}],
@@ -23,17 +26,26 @@ async def fetch_properties(storage: Path, payload_path: Path | None, output: Pat
         "rooms": [{"adults": 2}],
     }
     if payload_path:
-        body = json.loads(payload_path.read_text())
+        body = loads(payload_path.read_bytes())
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=headless)
         context = await browser.new_context(storage_state=str(storage))
         request = context.request
-        response = await request.post(PROPERTIES_URL, data=json.dumps(body), headers={"Content-Type": "application/json"})
+        response = await request.post(
+            PROPERTIES_URL,
+            data=dumps_bytes(body),
+            headers={"Content-Type": "application/json"},
+        )
         if not response.ok:
             raise RuntimeError(f"Request failed: {response.status} {await response.text()}")
-        data = await response.json()
-        output.write_text(json.dumps(data, indent=2))
+        encoded = await response.body()
+        if pretty:
+            # Re-encoding is only worth it for a human reader; otherwise keep the API bytes.
+            encoded = dumps_pretty(loads(encoded))
+        # Keep the event loop free while multi-megabyte result dumps hit the disk.
+        await asyncio.to_thread(output.parent.mkdir, parents=True, exist_ok=True)
+        await asyncio.to_thread(output.write_bytes, encoded)
         await context.close()
         await browser.close()
 
@@ -44,8 +56,13 @@ def main() -> None:
     parser.add_argument("--payload", type=Path)
     parser.add_argument("--output", type=Path, default=Path("data/downloads/hotel_results.json"))
     parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--pretty", action="store_true", help="Indent the saved JSON for reading")
     args = parser.parse_args()
-    asyncio.run(fetch_properties(args.storage, args.payload, args.output, not args.headed))
+    asyncio.run(
+        fetch_properties(
+            args.storage, args.payload, args.output, not args.headed, pretty=args.pretty
+        )
+    )
 
 
 if __name__ == "__main__":
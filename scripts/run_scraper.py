@@ -37,6 +37,7 @@ from secure_scraper.storage import SqliteStore
 if TYPE_CHECKING:  # pragma: no cover - import for type checking only
     from secure_scraper.storage.sqlite_store import SearchRunRecord
 from secure_scraper.tasks.search_payloads import RoomRequest, SearchParams
+from secure_scraper.utils.serialization import dumps
 
 
 def _resolve_destinations(settings: Settings) -> list[Destination]:
@@ -397,6 +398,9 @@ async def _execute_destination_runs(
         return context
 
     warmup_page = settings.search_warmup_enabled
+    token_cache_path = (
+        settings.account_token_cache_path if settings.account_token_cache_enabled else None
+    )
     login_flow = LoginFlow(settings)
     page = await login_flow.run(context)
     try:
@@ -404,7 +408,8 @@ async def _execute_destination_runs(
     except Exception:
         pass
 
-    client = SearchClient(context)
+    client = SearchClient(context, token_cache_path=token_cache_path)
+    await client.prewarm()
     consecutive_backend_failures = 0
 
     for scheduled in runs:
@@ -472,7 +477,7 @@ async def _execute_destination_runs(
                         await page.close()
                     except Exception:
                         pass
-                    client = SearchClient(context)
+                    client = SearchClient(context, token_cache_path=token_cache_path)
                     continue
                 except asyncio.CancelledError:
                     logging.warning(
@@ -487,7 +492,7 @@ async def _execute_destination_runs(
                         await page.close()
                     except Exception:
                         pass
-                    client = SearchClient(context)
+                    client = SearchClient(context, token_cache_path=token_cache_path)
                     continue
                 except (PatchrightError, PlaywrightError) as exc:
                     message = str(exc).lower()
@@ -509,7 +514,7 @@ async def _execute_destination_runs(
                             await page.close()
                         except Exception:
                             pass
-                        client = SearchClient(context)
+                        client = SearchClient(context, token_cache_path=token_cache_path)
                         continue
                     raise
                 except SessionRefreshError as exc:
@@ -527,7 +532,7 @@ async def _execute_destination_runs(
                         await page.close()
                     except Exception:
                         pass
-                    client = SearchClient(context)
+                    client = SearchClient(context, token_cache_path=token_cache_path)
                     continue
                 except BackendUnavailableError as exc:
                     backend_failure = exc
@@ -581,7 +586,9 @@ async def _execute_destination_runs(
                 context_obj = results.get("context")
                 context_payload = context_obj if isinstance(context_obj, dict) else None
                 request_id = context_payload.get("requestId") if context_payload else None
-                await db_store.store_run_payload(run_id, results)
+                # Serialise the context once for both the payload and the completion update.
+                context_json = dumps(context_payload) if context_payload else None
+                await db_store.store_run_payload(run_id, results, context_json=context_json)
                 await db_store.save_hotels(run_id, hotel_dicts)
                 await db_store.save_rates(run_id, rate_dicts)
                 await db_store.finalize_run(
@@ -590,6 +597,7 @@ async def _execute_destination_runs(
                     total_rates=len(rate_dicts),
                     request_id=request_id,
                     context=context_payload,
+                    context_json=context_json,
                 )
                 run_id = None
         except Exception as exc:
@@ -80,6 +80,7 @@ class LoginFlow:
                 page, context, cred_future, session_future
             )
         finally:
+            await self.verifier.aclose()
             self._remove_session_watchers(context, on_request, on_response)
             await self._maybe_stop_trace(context, trace_started, trace_path)
 
@@ -61,6 +61,11 @@ class TwoStepVerifier:
                 )
             self.otp_resolver = OtpResolver(secret=settings.mfa_secret, email_fetcher=email_fetcher)
 
+    async def aclose(self) -> None:
+        """Close the OTP resolver's email client; a later challenge reopens it on demand."""
+
+        await self.otp_resolver.aclose()
+
     async def maybe_solve(self, page: Page) -> bool:
         if not await self._challenge_present(page):
             return False
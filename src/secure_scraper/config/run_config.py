@@ -98,6 +98,12 @@ class StorageSection(BaseModel):
         default=None,
         description="Override SQLite synchronous PRAGMA (e.g., 'normal', 'full')",
     )
+    account_token_cache_enabled: Optional[bool] = Field(
+        default=None, description="Toggle persisting the search account token between runs"
+    )
+    account_token_cache_path: Optional[str] = Field(
+        default=None, description="Override the account token cache file path"
+    )
 
 
 class ManualDestinationSection(BaseModel):
@@ -264,6 +270,12 @@ class RunConfig(BaseModel):
             settings.sqlite_journal_mode = storage.sqlite_journal_mode
         if storage.sqlite_synchronous is not None:
             settings.sqlite_synchronous = storage.sqlite_synchronous
+        if storage.account_token_cache_enabled is not None:
+            settings.account_token_cache_enabled = storage.account_token_cache_enabled
+        if storage.account_token_cache_path:
+            settings.account_token_cache_path = _resolve_path(
+                storage.account_token_cache_path, base_dir
+            )
 
     def _apply_manual_destination(self, settings: "Settings") -> None:
         manual = self.manual_destination
@@ -203,6 +203,14 @@ class Settings(BaseSettings):
         default=False,
         description="If true, wait for warm-up properties payload via search redirect page",
     )
+    account_token_cache_enabled: bool = Field(
+        default=False,
+        description="Persist the search account token so a restart within its lifetime reuses it",
+    )
+    account_token_cache_path: Path = Field(
+        default=Path("data/storage/account_token.json"),
+        description="File holding the cached account token when account_token_cache_enabled is set",
+    )
     login_monitor_markers: bool = Field(
         default=False,
         description="If true, wait for credentials-signin/auth session network markers during login",
@@ -2,11 +2,11 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
 class LoginSelectors:
+    __slots__ = ()
+
     login_button = "a[class*='loginButton']"
     login_entry_url = "https://www.americanexpress.com/en-us/account/login?linknav=us-travel-subnav-login&DestPage=https://www.americanexpress.com/en-us/travel/"
     username_input = "#eliloUserID"
@@ -32,13 +32,14 @@ class LoginSelectors:
     )
     travel_url_pattern = re.compile(r"americanexpress\.com/.*/travel", re.IGNORECASE)
     book_root_url = "https://www.travel.americanexpress.com/en-us/book/"
-    _redirect_patterns: tuple[re.Pattern[str], ...] = (
-        login_url_pattern,
-        oauth_connect_pattern,
-        credentials_signin_pattern,
-        travel_credentials_signin_pattern,
+    # The individual redirect patterns above fused into one alternation so each navigation
+    # event costs a single regex scan (travel credentials-signin is covered by the generic
+    # ``americanexpress.com`` branch).
+    _redirect_union = re.compile(
+        r"americanexpress\.com/.*/(?:login|oauth/connect|auth/credentials-signin)",
+        re.IGNORECASE,
     )
 
     @staticmethod
     def is_login_redirect(url: str) -> bool:
-        return any(pattern.search(url) for pattern in LoginSelectors._redirect_patterns)
+        return LoginSelectors._redirect_union.search(url) is not None
@@ -1,19 +1,41 @@
 """Client for Amex Travel smartfill location lookups."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from contextlib import AbstractContextManager
-from typing import Any, Dict, Iterable, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Sequence
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
 SMARTFILL_URL = "https://amex-api.lxp.iseatz.com/hotel/smartfill"
+MAX_KEEPALIVE_CONNECTIONS = 20
+# Bound on in-flight smartfill requests so hydrating a whole catalog does not burst the API.
+MAX_CONCURRENT_LOOKUPS = 8
+LOOKUP_CACHE_SIZE = 512
+CATEGORY_KEYS = (
+    "cities",
+    "neighborhoods",
+    "airports",
+    "trainStations",
+    "regions",
+    "areas",
+    "pointsOfInterest",
+)
 
 
-class LocationClient(AbstractContextManager["LocationClient"]):
-    """Thin wrapper around the location smartfill endpoint."""
+class LocationClient:
+    """Thin async wrapper around the location smartfill endpoint.
+
+    The underlying HTTP/2 client keeps a pooled connection alive so concurrent lookups
+    (see :meth:`lookup_many`) share one TLS session instead of reconnecting per query.
+    Responses are memoised per ``(query, size)`` in a small LRU; failed lookups are
+    remembered as ``None`` so :meth:`lookup_best` does not retry them.
+    """
+
+    __slots__ = ("_client", "_base_url", "_cache")
 
     def __init__(
         self,
@@ -29,43 +51,86 @@ class LocationClient(AbstractContextManager["LocationClient"]):
         }
         if headers:
             default_headers.update(headers)
-        self._client = httpx.Client(timeout=timeout, headers=default_headers)
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers=default_headers,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+        )
         self._base_url = base_url
+        self._cache: OrderedDict[tuple[str, int | None], Optional[Dict[str, Any]]] = OrderedDict()
 
-    def close(self) -> None:
-        self._client.close()
+    async def aclose(self) -> None:
+        await self._client.aclose()
 
-    def __exit__(self, exc_type, exc, exc_tb) -> None:
-        self.close()
+    async def __aenter__(self) -> "LocationClient":
+        return self
 
-    def lookup(self, query: str, *, size: int | None = None) -> Dict[str, Any]:
+    async def __aexit__(self, exc_type, exc, exc_tb) -> None:
+        await self.aclose()
+
+    async def lookup(self, query: str, *, size: int | None = None) -> Dict[str, Any]:
+        key = (query, size)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
         params = {"query": query}
         if size is not None:
             params["size"] = str(size)
         logger.debug("Smartfill lookup query='%s' size=%s", query, size)
-        response = self._client.get(self._base_url, params=params)
+        response = await self._client.get(self._base_url, params=params)
         response.raise_for_status()
-        return response.json()
+        result = response.json()
+        self._remember(key, result)
+        return result
 
-    def lookup_best(self, query: str, *, size: int | None = None) -> Optional[Dict[str, Any]]:
+    async def lookup_best(self, query: str, *, size: int | None = None) -> Optional[Dict[str, Any]]:
+        key = (query, size)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
         try:
-            return self.lookup(query, size=size)
+            return await self.lookup(query, size=size)
         except httpx.HTTPError:
             logger.exception("Smartfill lookup failed for query '%s'", query)
+            self._remember(key, None)
             return None
 
+    def _remember(
+        self, key: tuple[str, int | None], value: Optional[Dict[str, Any]]
+    ) -> None:
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        if len(self._cache) > LOOKUP_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    async def lookup_many(
+        self,
+        queries: Sequence[str],
+        *,
+        size: int | None = None,
+        concurrency: int = MAX_CONCURRENT_LOOKUPS,
+    ) -> list[Optional[Dict[str, Any]]]:
+        """Run :meth:`lookup_best` for every query, at most ``concurrency`` at a time.
+
+        Results keep the input order.
+        """
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _lookup(query: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.lookup_best(query, size=size)
+
+        return await asyncio.gather(*(_lookup(query) for query in queries))
+
     @staticmethod
     def iter_candidates(payload: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
-        for key in (
-            "cities",
-            "neighborhoods",
-            "airports",
-            "trainStations",
-            "regions",
-            "areas",
-            "pointsOfInterest",
-        ):
-            entries = payload.get(key) or []
-            for entry in entries:
-                entry["_category"] = key
-                yield entry
+        """Yield every candidate tagged with its ``_category``; ``payload`` is left untouched."""
+
+        return (
+            {**entry, "_category": key}
+            for key in CATEGORY_KEYS
+            for entry in (payload.get(key) or ())
+        )
@@ -2,21 +2,40 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import suppress
-import base64
+import binascii
+import hashlib
 import json
 import logging
-from dataclasses import replace
+import os
+import tempfile
+import time
+from collections.abc import Awaitable, Iterable, Iterator, Sequence
+from contextlib import suppress
 from datetime import date
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, Optional
-from urllib.parse import urlencode, quote_plus
-
-from playwright.async_api import BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+from typing import Any, Dict, Optional, TypeVar
+from urllib.parse import quote_plus
+
+from playwright.async_api import (
+    BrowserContext,
+    Error as PlaywrightError,
+    Page,
+    TimeoutError as PlaywrightTimeoutError,
+)
 
 from secure_scraper.tasks.search_payloads import RoomRequest, SearchParams
+from secure_scraper.utils.serialization import JsonItems, dumps_bytes, loads
+
+try:  # pragma: no cover - pybase64 is an optional SIMD speed-up
+    import pybase64
+except ImportError:  # pragma: no cover - fall back to binascii
+    pybase64 = None  # type: ignore[assignment]
 
-logger = logging.getLogger(__name__)
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
 
 PROPERTIES_URL = "https://www.travel.americanexpress.com/en-us/book/api/lxp/hotel/properties"
 RESULTS_PAGE = (
@@ -30,6 +49,129 @@ BOOK_ROOT_URL = "https://www.travel.americanexpress.com/en-us/book/"
 NEXT_AUTH_COOKIE = "__Secure-next-auth.session-token"
 LEGACY_SESSION_COOKIES = {"amexsessioncookie", "aat"}
 BACKEND_RETRY_SLEEP_SECONDS = 150  # ~2.5 minute pause when API returns 500s
+MAX_CONCURRENT_PAGE_FETCHES = 4
+MAX_CONCURRENT_SEARCHES = 4
+READY_STATE_TIMEOUT_MS = 10_000
+READY_STATE_POLL_SECONDS = 0.1
+REDIRECT_SETTLE_TIMEOUT_S = 3.0
+WARMUP_HEAD_START_S = 2.0
+_B64_URLSAFE = bytes.maketrans(b"+/", b"-_")
+ACCOUNT_TOKEN_TTL_SECONDS = 25 * 60
+AUTH_RESPONSE_FALLBACK_TIMEOUT_MS = 2_000
+TOKEN_ATTEMPTS = 5
+TOKEN_ATTEMPT_CONCURRENCY = 2
+
+
+@lru_cache(maxsize=256)
+def _results_url_prefix(
+    location_id: str,
+    location_label: str,
+    rooms: tuple[tuple[int, tuple[int, ...]], ...],
+    page_size: int,
+) -> str:
+    """Encode the part of the results URL that stays fixed across dates and pages."""
+
+    children_ages = [age for _, ages in rooms for age in ages]
+    # Only the two free-text fields need percent-encoding; the rest are ints or constants.
+    return (
+        f"{RESULTS_PAGE}?adults={rooms[0][0]}&children={len(children_ages)}"
+        f"&childrenAges={'%2C'.join(map(str, children_ages))}&locationType=LOCATION_ID"
+        f"&pageSize={page_size}&placeName={quote_plus(location_label)}&rooms={len(rooms)}"
+        f"&sortingOption=FEATURED&placeId={quote_plus(location_id)}"
+        "&inav=us-travel-hp-hotels-search"
+    )
+
+
+def _mdy(value: date) -> str:
+    """Format ``value`` as ``MM/DD/YYYY`` without going through ``strftime``."""
+
+    return f"{value.month:02d}/{value.day:02d}/{value.year:04d}"
+
+
+@lru_cache(maxsize=256)
+def _redirect_template(
+    check_in: date,
+    check_out: date,
+    rooms: tuple[tuple[int, tuple[int, ...]], ...],
+    program_filter: tuple[str, ...],
+) -> Dict[str, Any]:
+    """Build the location-independent parts of the search redirect request.
+
+    The result is shared between calls, so callers must treat it (and its values) as
+    read-only and only reference them from a freshly built payload.
+    """
+
+    template: Dict[str, Any] = {
+        "rooms": [{"adults": adults, "children": list(children)} for adults, children in rooms],
+        "startDate": _mdy(check_in),
+        "endDate": _mdy(check_out),
+        "horizonsConfig": {
+            "includeCenturion": True,
+            "isForcedLoginFeatureFlagEnabled": True,
+            "isCardModalEnabled": False,
+            "isFhrThcHorizonsEnabled": bool(program_filter),
+        },
+    }
+    if program_filter:
+        template["filters"] = {"clientProgramFilter": list(program_filter)}
+    return template
+
+
+def _urlsafe_b64encode(data: bytes) -> bytes:
+    if pybase64 is not None:
+        return pybase64.urlsafe_b64encode(data)
+    return binascii.b2a_base64(data, newline=False).translate(_B64_URLSAFE)
+
+
+def _is_properties_post(response: Any, _prefix: str = PROPERTIES_URL) -> bool:
+    """Match the warm-up properties POST; the cheap method check rejects most traffic first."""
+
+    return response.request.method == "POST" and response.url.startswith(_prefix)
+
+
+def _session_fingerprint(cookies: list[Any]) -> Optional[str]:
+    """Hash the login session cookies so a cached token is only reused by the same session."""
+
+    pairs = sorted(
+        f"{cookie['name']}={cookie.get('value', '')}"
+        for cookie in cookies
+        if cookie.get("name") == NEXT_AUTH_COOKIE or cookie.get("name") in LEGACY_SESSION_COOKIES
+    )
+    if not pairs:
+        return None
+    return hashlib.sha256("\n".join(pairs).encode()).hexdigest()
+
+
+async def _gather_or_cancel(coros: Iterable[Awaitable[_T]]) -> list[_T]:
+    """Await ``coros`` concurrently in order; if one fails, cancel the rest before raising."""
+
+    # asyncio.TaskGroup would do this but needs Python 3.11; the package supports 3.10.
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _is_auth_session(response: Any, _prefix: str = AUTH_SESSION_URL) -> bool:
+    return response.url.startswith(_prefix)
+
+
+def _preview(body: bytes, limit: int = 128) -> str:
+    """Decode just the first ``limit`` bytes of a response body for log messages."""
+
+    return body[:limit].decode("utf-8", errors="replace")
+
+
+def _total_pages(pagination: Dict[str, Any]) -> Optional[int]:
+    value = pagination.get("totalPages") or pagination.get("pageCount")
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
 
 
 class UnauthorizedSearchError(RuntimeError):
@@ -56,9 +198,31 @@ class SessionRefreshError(RuntimeError):
 
 
 class SearchClient:
-    def __init__(self, context: BrowserContext) -> None:
+    def __init__(
+        self,
+        context: BrowserContext,
+        *,
+        token_cache_path: Optional[Path] = None,
+    ) -> None:
         self.context = context
+        self._token_cache_path = token_cache_path
         self._account_token: Optional[str] = None
+        self._token_future: Optional[asyncio.Future[str]] = None
+        self._token_future_forced = False
+        self._session_refresh_future: Optional[asyncio.Future[None]] = None
+        self._token_expiry = 0.0
+
+    async def prewarm(self) -> None:
+        """Open a pooled connection to the travel host before the first search.
+
+        Call once per client ahead of a batch; later API requests reuse the kept-alive
+        connection instead of paying a fresh TCP/TLS handshake.
+        """
+
+        try:
+            await self.context.request.head(BOOK_ROOT_URL)
+        except PlaywrightError as exc:
+            logger.debug("Connection prewarm failed: %s", exc)
 
     async def fetch_properties(
         self,
@@ -66,48 +230,87 @@ class SearchClient:
         *,
         warmup_page: bool = True,
         extra_headers: Optional[Dict[str, str]] = None,
-    ) -> Dict[str, Any]:
+        stream_items: Optional[str] = None,
+    ) -> Dict[str, Any] | Iterator[Any]:
+        """Fetch every results page for ``params`` and merge them into one response.
+
+        With ``stream_items`` set to an ijson prefix such as ``"hotels.item"``, the raw
+        page bodies are kept and an iterator over the matching values of every page is
+        returned instead, so callers that only need a few fields never build the full
+        hotel dicts. This parses incrementally when the optional ``ijson`` is installed.
+        """
+
         logger.info(
             "Starting property fetch for %s (%s -> %s)",
             params.location_id,
             params.check_in,
             params.check_out,
         )
-        base_headers = {"Content-Type": "application/json"}
-        if extra_headers:
-            base_headers.update(extra_headers)
+        # Built once and shared read-only by every page request below.
+        base_headers = {"Content-Type": "application/json", **(extra_headers or {})}
 
         try:
             account_token = await self._ensure_account_token()
         except RuntimeError as exc:
             raise SessionRefreshError(str(exc)) from exc
 
-        aggregated_response: Optional[Dict[str, Any]] = None
+        page_responses: list[Dict[str, Any]] = []
+        page_items: list[JsonItems] = []
         page_number = params.page
+        # Only pagination.page changes between pages, so build the request body once.
+        payload = params.to_payload()
         while True:
-            page_params = replace(params, page=page_number)
-            warmup_current = warmup_page and page_number == params.page
-            page_response, account_token = await self._fetch_properties_page(
-                page_params,
-                account_token=account_token,
-                headers=base_headers,
-                warmup_page=warmup_current,
-            )
+            payload["pagination"]["page"] = page_number
+            if page_number == params.page:
+                page_body, account_token = await self._fetch_first_page(
+                    params,
+                    payload=payload,
+                    account_token=account_token,
+                    headers=base_headers,
+                    warmup_page=warmup_page,
+                )
+            else:
+                page_body, account_token = await self._fetch_next_page(
+                    payload, account_token=account_token, headers=base_headers
+                )
 
-            hotels = page_response.get("hotels", []) if page_response else []
-            if aggregated_response is None:
-                aggregated_response = page_response
+            if stream_items is None:
+                page_response = loads(page_body)
+                page_responses.append(page_response)
+                has_hotels = bool(page_response.get("hotels")) if page_response else False
+                pagination = (page_response or {}).get("context", {}).get("pagination", {}) or {}
             else:
-                aggregated_response.setdefault("hotels", []).extend(hotels)
-                if "context" in page_response:
-                    aggregated_response.setdefault("context", {}).update(page_response["context"])
+                page = JsonItems(page_body)
+                page_items.append(page)
+                # One pass (or one parse) answers both questions for this page.
+                first = page.first("hotels.item", "context.pagination")
+                has_hotels = "hotels.item" in first
+                pagination = first.get("context.pagination") or {}
 
-            pagination = (page_response or {}).get("context", {}).get("pagination", {}) or {}
             has_next = pagination.get("hasNext")
-            if not has_next or not hotels:
+            if not has_next or not has_hotels:
+                break
+            total_pages = _total_pages(pagination)
+            if total_pages and total_pages > page_number:
+                # The page count is known, so fetch the rest together instead of one by one.
+                remaining = await self._fetch_pages_concurrently(
+                    params,
+                    payload,
+                    range(page_number + 1, total_pages + 1),
+                    account_token=account_token,
+                    headers=base_headers,
+                )
+                if stream_items is None:
+                    page_responses.extend(loads(body) for body in remaining)
+                else:
+                    page_items.extend(map(JsonItems, remaining))
                 break
             page_number += 1
 
+        if stream_items is not None:
+            return chain.from_iterable(page.items(stream_items) for page in page_items)
+
+        aggregated_response = self._combine_pages(page_responses)
         if aggregated_response is None:
             aggregated_response = {
                 "context": {
@@ -122,13 +325,190 @@ class SearchClient:
 
         return aggregated_response
 
+    async def fetch_many(
+        self,
+        params_list: Sequence[SearchParams],
+        *,
+        concurrency: int = MAX_CONCURRENT_SEARCHES,
+        **fetch_kwargs: Any,
+    ) -> list[Dict[str, Any] | Iterator[Any]]:
+        """Run :meth:`fetch_properties` for several searches at once, preserving order.
+
+        The account token is resolved up front so the searches do not queue on it behind
+        the semaphore. If any search fails, the others are cancelled and the error raised.
+        """
+
+        try:
+            await self._ensure_account_token()
+        except RuntimeError as exc:
+            raise SessionRefreshError(str(exc)) from exc
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _fetch(params: SearchParams) -> Dict[str, Any] | Iterator[Any]:
+            async with semaphore:
+                return await self.fetch_properties(params, **fetch_kwargs)
+
+        return await _gather_or_cancel(_fetch(params) for params in params_list)
+
+    async def _fetch_pages_concurrently(
+        self,
+        params: SearchParams,
+        payload: Dict[str, Any],
+        pages: range,
+        *,
+        account_token: str,
+        headers: Dict[str, str],
+    ) -> list[bytes]:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGE_FETCHES)
+
+        async def _fetch(page_number: int) -> bytes:
+            page_payload = {**payload, "pagination": {**payload["pagination"], "page": page_number}}
+            async with semaphore:
+                page_body, _ = await self._fetch_next_page(
+                    page_payload, account_token=account_token, headers=headers
+                )
+            return page_body
+
+        logger.info(
+            "Fetching pages %s-%s for %s concurrently",
+            pages[0],
+            pages[-1],
+            params.location_id,
+        )
+        # A failed page (401 exhaustion, 5xx) cancels its siblings so they stop hitting the
+        # API and the browser context once fetch_properties has already failed.
+        return await _gather_or_cancel(_fetch(page_number) for page_number in pages)
+
+    @staticmethod
+    def _combine_pages(page_responses: list[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Fold every page into the first response in one pass.
+
+        Hotels are concatenated in page order and later ``context`` keys win.
+        """
+
+        if not page_responses or page_responses[0] is None:
+            return None
+        aggregated = page_responses[0]
+        if len(page_responses) == 1:
+            return aggregated
+        all_hotels: list[Dict[str, Any]] = []
+        merged_context: Dict[str, Any] = {}
+        for page_response in page_responses:
+            if not page_response:
+                continue
+            all_hotels.extend(page_response.get("hotels", ()))
+            if "context" in page_response:
+                merged_context.update(page_response["context"])
+        aggregated["hotels"] = all_hotels
+        if merged_context or "context" in aggregated:
+            aggregated["context"] = merged_context
+        return aggregated
+
     async def _ensure_account_token(self, *, force_refresh: bool = False) -> str:
-        if self._account_token and not force_refresh:
-            return self._account_token
+        """Return the account token, sharing one in-flight load between concurrent callers.
+
+        Callers that arrive while a load is running await the same future instead of
+        opening their own Playwright page. A forced refresh that finds a non-forced load
+        in flight queues one forced load behind it, since that load may hand back the
+        token that just got a 401; later forced callers share the queued load.
+        """
+
+        # No await between these checks and the assignments below, so they cannot race.
+        if self._token_future is None:
+            if (
+                self._account_token
+                and not force_refresh
+                and time.monotonic() < self._token_expiry
+            ):
+                return self._account_token
+            self._start_token_load(
+                self._load_account_token(force_refresh=force_refresh), forced=force_refresh
+            )
+        elif force_refresh and not self._token_future_forced:
+            self._start_token_load(self._reload_account_token(self._token_future), forced=True)
+        # Shield the shared load so one cancelled caller does not fail the others.
+        return await asyncio.shield(self._token_future)
+
+    def _start_token_load(self, load: Awaitable[str], *, forced: bool) -> None:
+        future = asyncio.ensure_future(load)
+        future.add_done_callback(self._clear_token_future)
+        self._token_future = future
+        self._token_future_forced = forced
+
+    async def _reload_account_token(self, previous: asyncio.Future[str]) -> str:
+        # Let the running load finish first so two Playwright pages never fetch at once.
+        await asyncio.wait([previous])
+        return await self._load_account_token(force_refresh=True)
+
+    def _clear_token_future(self, future: asyncio.Future[str]) -> None:
+        if self._token_future is future:
+            self._token_future = None
+        if not future.cancelled():
+            # Mark the exception retrieved; every waiter has already been handed it.
+            future.exception()
+
+    async def _load_account_token(self, *, force_refresh: bool) -> str:
+        if not force_refresh and self._token_cache_path is not None:
+            fingerprint = _session_fingerprint(await self.context.cookies())
+            cached = await asyncio.to_thread(self._read_cached_token, fingerprint)
+            if cached is not None:
+                token, remaining = cached
+                logger.info("Reusing cached account token (%.0fs left)", remaining)
+                self._account_token = token
+                self._token_expiry = time.monotonic() + remaining
+                return token
         token = await self._fetch_account_token()
         self._account_token = token
+        self._token_expiry = time.monotonic() + ACCOUNT_TOKEN_TTL_SECONDS
+        if self._token_cache_path is not None:
+            # Fingerprint after the fetch: loading the book page may rotate cookies.
+            fingerprint = _session_fingerprint(await self.context.cookies())
+            await asyncio.to_thread(self._write_cached_token, token, fingerprint)
         return token
 
+    def _read_cached_token(self, fingerprint: Optional[str]) -> Optional[tuple[str, float]]:
+        if fingerprint is None or self._token_cache_path is None:
+            return None
+        try:
+            entry = loads(self._token_cache_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.debug("Ignoring unreadable token cache %s: %s", self._token_cache_path, exc)
+            return None
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return None
+        token = entry.get("token")
+        remaining = float(entry.get("expires_at") or 0) - time.time()
+        if not token or remaining <= 0:
+            return None
+        return str(token), remaining
+
+    def _write_cached_token(self, token: str, fingerprint: Optional[str]) -> None:
+        if fingerprint is None or self._token_cache_path is None:
+            return
+        entry = {
+            "token": token,
+            "fingerprint": fingerprint,
+            "expires_at": time.time() + ACCOUNT_TOKEN_TTL_SECONDS,
+        }
+        path = self._token_cache_path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # mkstemp creates the file 0600, so the token is never readable by others, and
+            # os.replace swaps it in whole for concurrent readers.
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(dumps_bytes(entry))
+                os.replace(tmp_name, path)
+            except BaseException:
+                with suppress(OSError):
+                    os.unlink(tmp_name)
+                raise
+        except OSError as exc:
+            logger.debug("Failed to persist token cache %s: %s", self._token_cache_path, exc)
+
     async def _has_authenticated_cookies(self) -> bool:
         cookies = await self.context.cookies()
         names = {cookie.get("name") for cookie in cookies if cookie.get("name")}
@@ -136,78 +516,175 @@ class SearchClient:
             return True
         return LEGACY_SESSION_COOKIES.issubset(names)
 
-    async def _fetch_properties_page(
+    async def _fetch_first_page(
         self,
         params: SearchParams,
         *,
+        payload: Dict[str, Any],
         account_token: str,
         headers: Dict[str, str],
         warmup_page: bool,
-    ) -> tuple[Dict[str, Any], str]:
+    ) -> tuple[bytes, str]:
         current_token = account_token
-        payload = params.to_payload()
         use_warmup = warmup_page
         last_backend_error: BackendUnavailableError | None = None
 
         for refresh_attempt in range(3):
-            page: Optional[Page] = None
-            warmup_data: Optional[Dict[str, Any]] = None
             try:
-                if use_warmup:
-                    try:
-                        page = await self._perform_search_redirect(params, current_token)
-                        logger.info("Waiting for warm-up properties payload via page network response")
-                        response = await page.wait_for_event(
-                            "response",
-                            lambda r: r.url.startswith(PROPERTIES_URL)
-                            and r.request.method == "POST",
-                            timeout=10_000,
-                        )
-                        warmup_data = await response.json()
-                        logger.info("Captured properties payload via warm-up page")
-                    except (asyncio.TimeoutError, PlaywrightTimeoutError, RuntimeError):
-                        logger.warning("Warm-up capture failed; falling back to direct POST")
-            finally:
-                try:
-                    if page:
-                        await page.close()
-                except Exception:
-                    logger.debug("Failed to close search redirect page", exc_info=True)
-
-            if warmup_data is not None:
-                return warmup_data, current_token
-
-            try:
-                page_response = await self._post_properties(payload, headers)
-                return page_response, current_token
-            except UnauthorizedSearchError as exc:
-                logger.warning(
-                    "Hotel properties POST returned %s; refreshing session (attempt %s)",
-                    exc.status,
-                    refresh_attempt + 1,
+                page_body = await self._request_first_page(
+                    params,
+                    payload=payload,
+                    account_token=current_token,
+                    headers=headers,
+                    use_warmup=use_warmup,
                 )
-                try:
-                    current_token = await self._ensure_account_token(force_refresh=True)
-                except RuntimeError as token_error:
-                    raise SessionRefreshError(str(token_error)) from token_error
-                await self._refresh_travel_session()
+                return page_body, current_token
+            except UnauthorizedSearchError as exc:
+                current_token = await self._recover_unauthorized(exc, refresh_attempt)
                 use_warmup = True
             except BackendUnavailableError as exc:
                 last_backend_error = exc
-                logger.warning(
-                    "Hotel properties POST returned %s; retrying (%s/3)",
-                    exc.status,
-                    refresh_attempt + 1,
-                )
-                await asyncio.sleep(BACKEND_RETRY_SLEEP_SECONDS)
-                await asyncio.sleep(min(5, refresh_attempt + 1))
+                await self._backoff_backend_error(exc, refresh_attempt)
                 continue
 
         if last_backend_error is not None:
             raise last_backend_error
         raise SessionRefreshError("Search request failed after refreshing session")
 
-    async def _post_properties(self, payload: dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+    async def _request_first_page(
+        self,
+        params: SearchParams,
+        *,
+        payload: Dict[str, Any],
+        account_token: str,
+        headers: Dict[str, str],
+        use_warmup: bool,
+    ) -> bytes:
+        if not use_warmup:
+            return await self._post_properties(payload, headers)
+        page: Optional[Page] = None
+        try:
+            try:
+                page = await self._perform_search_redirect(params, account_token)
+            except (asyncio.TimeoutError, PlaywrightTimeoutError, RuntimeError):
+                logger.warning("Search redirect failed; falling back to direct POST")
+                return await self._post_properties(payload, headers)
+            return await self._race_warmup_and_post(page, payload, headers)
+        finally:
+            try:
+                if page:
+                    await page.close()
+            except Exception:
+                logger.debug("Failed to close search redirect page", exc_info=True)
+
+    async def _race_warmup_and_post(
+        self, page: Page, payload: Dict[str, Any], headers: Dict[str, str]
+    ) -> bytes:
+        """Return whichever of the warm-up capture and the direct POST succeeds first.
+
+        The warm-up gets ``WARMUP_HEAD_START_S`` to itself, so a prompt capture costs no
+        extra properties request; the direct POST only starts once that head start runs
+        out or the capture comes back empty. If the first one to finish fails, the other
+        decides the outcome; a direct POST error is only raised once the warm-up capture
+        has also come back empty.
+        """
+
+        warmup_task = asyncio.create_task(self._capture_warmup_response(page))
+        direct_task: Optional[asyncio.Task[bytes]] = None
+        try:
+            done, _ = await asyncio.wait({warmup_task}, timeout=WARMUP_HEAD_START_S)
+            if done:
+                warmup_data = warmup_task.result()
+                if warmup_data is not None:
+                    return warmup_data
+                return await self._post_properties(payload, headers)
+            direct_task = asyncio.create_task(self._post_properties(payload, headers))
+            done, _ = await asyncio.wait(
+                {warmup_task, direct_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if warmup_task in done and warmup_task.result() is not None:
+                return warmup_task.result()
+            if direct_task in done and direct_task.exception() is None:
+                return direct_task.result()
+            warmup_data = await warmup_task
+            if warmup_data is not None:
+                return warmup_data
+            return await direct_task
+        finally:
+            for task in (warmup_task, direct_task):
+                if task is not None and not task.done():
+                    task.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await task
+
+    async def _capture_warmup_response(self, page: Page) -> Optional[bytes]:
+        logger.info("Waiting for warm-up properties payload via page network response")
+        try:
+            response = await page.wait_for_event(
+                "response",
+                _is_properties_post,
+                timeout=10_000,
+            )
+            data = await response.body()
+        except (asyncio.TimeoutError, PlaywrightTimeoutError, RuntimeError):
+            logger.warning("Warm-up capture failed; relying on direct POST")
+            return None
+        logger.info("Captured properties payload via warm-up page")
+        return data
+
+    async def _fetch_next_page(
+        self,
+        payload: Dict[str, Any],
+        *,
+        account_token: str,
+        headers: Dict[str, str],
+    ) -> tuple[bytes, str]:
+        """Fetch a follow-up page with a direct POST; only page one needs the warm-up redirect."""
+
+        current_token = account_token
+        last_backend_error: BackendUnavailableError | None = None
+
+        for refresh_attempt in range(3):
+            try:
+                page_body = await self._post_properties(payload, headers)
+                return page_body, current_token
+            except UnauthorizedSearchError as exc:
+                current_token = await self._recover_unauthorized(exc, refresh_attempt)
+            except BackendUnavailableError as exc:
+                last_backend_error = exc
+                await self._backoff_backend_error(exc, refresh_attempt)
+
+        if last_backend_error is not None:
+            raise last_backend_error
+        raise SessionRefreshError("Search request failed after refreshing session")
+
+    async def _recover_unauthorized(
+        self, exc: UnauthorizedSearchError, refresh_attempt: int
+    ) -> str:
+        logger.warning(
+            "Hotel properties POST returned %s; refreshing session (attempt %s)",
+            exc.status,
+            refresh_attempt + 1,
+        )
+        try:
+            token = await self._ensure_account_token(force_refresh=True)
+        except RuntimeError as token_error:
+            raise SessionRefreshError(str(token_error)) from token_error
+        await self._refresh_travel_session()
+        return token
+
+    async def _backoff_backend_error(
+        self, exc: BackendUnavailableError, refresh_attempt: int
+    ) -> None:
+        logger.warning(
+            "Hotel properties POST returned %s; retrying (%s/3)",
+            exc.status,
+            refresh_attempt + 1,
+        )
+        await asyncio.sleep(BACKEND_RETRY_SLEEP_SECONDS)
+        await asyncio.sleep(min(5, refresh_attempt + 1))
+
+    async def _post_properties(self, payload: dict[str, Any], headers: Dict[str, str]) -> bytes:
         location = payload.get("location")
         page = payload.get("pagination", {}).get("page")
         if page:
@@ -220,11 +697,11 @@ class SearchClient:
             logger.info("Fetching properties for %s via direct POST", location)
         response = await self.context.request.post(
             PROPERTIES_URL,
-            data=json.dumps(payload),
-            headers=dict(headers),
+            data=dumps_bytes(payload),
+            headers=headers,
         )
         if response.ok:
-            return await response.json()
+            return await response.body()
         text = await response.text()
         if response.status in (401, 403):
             raise UnauthorizedSearchError(response.status, text)
@@ -233,45 +710,71 @@ class SearchClient:
         raise RuntimeError(f"Search request failed ({response.status}): {text[:512]}")
 
     async def _refresh_travel_session(self) -> None:
+        """Reload the book page, sharing one navigation between concurrent 401s.
+
+        Concurrent page fetches that are rejected together would otherwise each open
+        their own browser page to refresh the same session.
+        """
+
+        if self._session_refresh_future is None:
+            future = asyncio.ensure_future(self._navigate_travel_session())
+            future.add_done_callback(self._clear_session_refresh_future)
+            self._session_refresh_future = future
+        await asyncio.shield(self._session_refresh_future)
+
+    def _clear_session_refresh_future(self, future: asyncio.Future[None]) -> None:
+        if self._session_refresh_future is future:
+            self._session_refresh_future = None
+        if not future.cancelled():
+            future.exception()
+
+    async def _navigate_travel_session(self) -> None:
         logger.info("Refreshing travel session after failed properties request")
         page = await self.context.new_page()
         try:
             await page.goto(BOOK_ROOT_URL, wait_until="domcontentloaded")
-            try:
-                await page.wait_for_load_state("networkidle", timeout=10_000)
-            except PlaywrightTimeoutError:
-                logger.debug("Travel session refresh networkidle wait timed out")
+            if not await self._wait_ready(page):
+                logger.debug("Travel session refresh readyState wait timed out")
         finally:
             await page.close()
 
+    @staticmethod
+    async def _wait_ready(page: Page, timeout_ms: int = READY_STATE_TIMEOUT_MS) -> bool:
+        """Poll ``document.readyState`` until ``complete``.
+
+        Amex pages keep firing telemetry beacons, so ``networkidle`` almost never
+        settles and used to burn the full timeout on every navigation.
+        """
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        while True:
+            try:
+                if await page.evaluate("document.readyState") == "complete":
+                    return True
+            except PlaywrightError:
+                # The execution context is replaced while the page is still navigating.
+                pass
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(READY_STATE_POLL_SECONDS)
+
+    @staticmethod
     def _build_results_url(params: SearchParams) -> str:
         if not params.rooms:
             raise ValueError("At least one room configuration is required")
-        total_children = sum(len(room.children) for room in params.rooms)
-        children_ages: list[int] = [
-            age for room in params.rooms for age in room.children
-        ]
-        room = params.rooms[0]
-        query_dict = {
-            "adults": room.adults,
-            "checkIn": params.check_in.isoformat(),
-            "checkOut": params.check_out.isoformat(),
-            "children": total_children,
-            "childrenAges": ",".join(map(str, children_ages)) if children_ages else "",
-            "locationType": "LOCATION_ID",
-            "page": params.page,
-            "pageSize": params.page_size,
-            "placeName": params.location_label,
-            "rooms": len(params.rooms),
-            "sortingOption": "FEATURED",
-            "placeId": params.location_id,
-            "inav": "us-travel-hp-hotels-search",
-        }
-        return f"{RESULTS_PAGE}?{urlencode(query_dict)}"
+        rooms = tuple((room.adults, tuple(room.children)) for room in params.rooms)
+        prefix = _results_url_prefix(
+            params.location_id, params.location_label, rooms, params.page_size
+        )
+        return (
+            f"{prefix}&checkIn={params.check_in.isoformat()}"
+            f"&checkOut={params.check_out.isoformat()}&page={params.page}"
+        )
 
     @staticmethod
     def from_capture(path: Path) -> SearchParams:
-        body = json.loads(path.read_text())
+        body = loads(path.read_bytes())
         rooms = [
             RoomRequest(adults=item.get("adults", 1), children=item.get("children", []))
             for item in body.get("rooms", [])
@@ -296,49 +799,24 @@ class SearchClient:
         if not await self._has_authenticated_cookies():
             logger.warning("Authentication cookies missing; login required before token fetch")
             raise RuntimeError("Authentication cookies missing; login required before token fetch")
+        # Attempts run TOKEN_ATTEMPT_CONCURRENCY at a time so one slow page load does not
+        # hold up the next try; later waves keep the old one-second spacing.
+        semaphore = asyncio.Semaphore(TOKEN_ATTEMPT_CONCURRENCY)
+
+        async def _bounded_attempt(attempt: int) -> tuple[Optional[str], Optional[int]]:
+            async with semaphore:
+                if attempt >= TOKEN_ATTEMPT_CONCURRENCY:
+                    await asyncio.sleep(1)
+                return await self._single_token_attempt(attempt)
+
+        tasks = [
+            asyncio.create_task(_bounded_attempt(attempt)) for attempt in range(TOKEN_ATTEMPTS)
+        ]
         empty_auth_responses = 0
-        for attempt in range(5):
-            logger.info("Requesting account token (attempt %s)", attempt + 1)
-            page = await self.context.new_page()
-            response_task = asyncio.create_task(
-                page.wait_for_event(
-                    "response",
-                    lambda r: r.url.startswith(AUTH_SESSION_URL),
-                    timeout=10_000,
-                )
-            )
-            try:
-                await page.goto(BOOK_ROOT_URL, wait_until="domcontentloaded")
-                try:
-                    await page.wait_for_load_state("networkidle", timeout=10_000)
-                except PlaywrightTimeoutError:
-                    logger.debug("Network idle wait timed out while preparing auth session fetch")
-                token, status, preview = await self._fetch_account_token_via_request()
-                if not token:
-                    try:
-                        awaited_response = await response_task
-                    except PlaywrightTimeoutError:
-                        logger.warning("auth/session not observed via page traffic on attempt %s", attempt + 1)
-                    except Exception as exc:
-                        logger.warning(
-                            "auth/session response wait failed on attempt %s: %s",
-                            attempt + 1,
-                            exc,
-                        )
-                    else:
-                        try:
-                            data = await awaited_response.json()
-                        except Exception:
-                            text_preview = (await awaited_response.text())[:128]
-                            logger.warning(
-                                "auth/session page response not JSON on attempt %s: %s",
-                                attempt + 1,
-                                text_preview,
-                            )
-                        else:
-                            token = data.get("clientCustomerId")
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                token, status = await next_done
                 if token:
-                    logger.info("Obtained account token on attempt %s", attempt + 1)
                     return token
                 if status == 200:
                     empty_auth_responses += 1
@@ -351,109 +829,168 @@ class SearchClient:
                         )
                 else:
                     empty_auth_responses = 0
-                if status:
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        raise RuntimeError("Unable to retrieve account token from auth session endpoint")
+
+    async def _single_token_attempt(self, attempt: int) -> tuple[Optional[str], Optional[int]]:
+        """Run one token fetch on a fresh page, returning the token (if any) and HTTP status."""
+
+        logger.info("Requesting account token (attempt %s)", attempt + 1)
+        page = await self.context.new_page()
+        # Record auth/session responses passively; a waiter task is only created
+        # when the direct request fails and the page has not produced one yet.
+        observed_responses: list[Any] = []
+
+        def _observe(response: Any) -> None:
+            if _is_auth_session(response):
+                observed_responses.append(response)
+
+        page.on("response", _observe)
+        try:
+            # The session cookies are in place by domcontentloaded; nothing else on the
+            # page is needed before calling the auth endpoint directly.
+            await page.goto(BOOK_ROOT_URL, wait_until="domcontentloaded")
+            cookie_header = await self._auth_cookie_header()
+            token, status, preview = await self._fetch_account_token_via_request(cookie_header)
+            if not token:
+                try:
+                    if observed_responses:
+                        awaited_response = observed_responses[-1]
+                    else:
+                        awaited_response = await page.wait_for_event(
+                            "response",
+                            _is_auth_session,
+                            timeout=AUTH_RESPONSE_FALLBACK_TIMEOUT_MS,
+                        )
+                except PlaywrightTimeoutError:
+                    logger.warning("auth/session not observed via page traffic on attempt %s", attempt + 1)
+                except Exception as exc:
                     logger.warning(
-                        "auth/session HTTP %s on attempt %s (preview: %s)",
-                        status,
+                        "auth/session response wait failed on attempt %s: %s",
                         attempt + 1,
-                        preview,
+                        exc,
                     )
                 else:
-                    logger.warning(
-                        "auth/session fetch failed on attempt %s: %s",
-                        attempt + 1,
-                        preview,
-                    )
-            finally:
-                if not response_task.done():
-                    response_task.cancel()
-                    with suppress(asyncio.CancelledError):
-                        await response_task
-                try:
-                    await page.close()
-                except Exception as exc:
-                    logger.debug("Failed to close token fetch page: %s", exc)
-            await asyncio.sleep(1)
-        raise RuntimeError("Unable to retrieve account token from auth session endpoint")
+                    page_body = b""
+                    try:
+                        page_body = await awaited_response.body()
+                        data = loads(page_body)
+                    except Exception:
+                        logger.warning(
+                            "auth/session page response not JSON on attempt %s: %s",
+                            attempt + 1,
+                            _preview(page_body),
+                        )
+                    else:
+                        token = data.get("clientCustomerId")
+            if token:
+                logger.info("Obtained account token on attempt %s", attempt + 1)
+                return token, status
+            if status:
+                logger.warning(
+                    "auth/session HTTP %s on attempt %s (preview: %s)",
+                    status,
+                    attempt + 1,
+                    preview,
+                )
+            else:
+                logger.warning(
+                    "auth/session fetch failed on attempt %s: %s",
+                    attempt + 1,
+                    preview,
+                )
+            return None, status
+        finally:
+            try:
+                await page.close()
+            except Exception as exc:
+                logger.debug("Failed to close token fetch page: %s", exc)
+
+    async def _auth_cookie_header(self) -> Optional[str]:
+        """Return the ``Cookie`` header for the auth endpoint from the current jar.
+
+        Read fresh on every attempt, after that attempt's navigation, because loading the
+        book page may rotate the session cookies.
+        """
 
-    async def _fetch_account_token_via_request(self) -> tuple[Optional[str], Optional[int], str]:
         cookies = await self.context.cookies([BOOK_ROOT_URL, AUTH_SESSION_URL])
         cookie_pairs = [
             f"{cookie.get('name')}={cookie.get('value')}"
             for cookie in cookies
             if cookie.get("name") and cookie.get("value")
         ]
+        return "; ".join(cookie_pairs) or None
+
+    async def _fetch_account_token_via_request(
+        self, cookie_header: Optional[str]
+    ) -> tuple[Optional[str], Optional[int], str]:
         headers = {
             "Accept": "application/json, text/plain, */*",
             "Referer": BOOK_ROOT_URL,
             "Pragma": "no-cache",
             "Cache-Control": "no-cache",
         }
-        if cookie_pairs:
-            headers["Cookie"] = "; ".join(cookie_pairs)
+        if cookie_header:
+            headers["Cookie"] = cookie_header
         response = await self.context.request.get(AUTH_SESSION_URL, headers=headers)
-        text = await response.text()
+        body = await response.body()
         token = None
         if response.ok:
             try:
-                data = json.loads(text)
+                data = loads(body)
             except json.JSONDecodeError:
-                logger.warning("auth/session response not JSON despite HTTP 200: %s", text[:128])
+                logger.warning(
+                    "auth/session response not JSON despite HTTP 200: %s", _preview(body)
+                )
             else:
                 token = data.get("clientCustomerId")
-        return token, response.status, text[:128]
+        return token, response.status, _preview(body)
 
     async def _perform_search_redirect(self, params: SearchParams, account_token: str) -> Page:
-        enable_program_filter = bool(params.program_filter)
-        payload = {
-            "request": {
-                "rooms": [
-                    {
-                        "adults": room.adults,
-                        "children": room.children,
-                    }
-                    for room in params.rooms
-                ],
-                "location": {
-                    "geoLocation": {"latitude": params.latitude, "longitude": params.longitude},
-                    "query": params.location_label,
-                    "name": params.location_label,
-                    "label": params.location_label,
-                    "airportCode": "",
-                    "type": "CITY",
-                    "id": params.location_id,
-                    "searchIdType": "LOCATION_ID",
-                },
-                "startDate": params.check_in.strftime("%m/%d/%Y"),
-                "endDate": params.check_out.strftime("%m/%d/%Y"),
-                "inavLocation": "hp-hotels",
-                "horizonsConfig": {
-                    "includeCenturion": True,
-                    "isForcedLoginFeatureFlagEnabled": True,
-                    "isCardModalEnabled": False,
-                    "isFhrThcHorizonsEnabled": enable_program_filter,
-                },
-                "inav": "us-travel-hp-hotels-search",
-                "accountToken": account_token,
+        template = _redirect_template(
+            params.check_in,
+            params.check_out,
+            tuple((room.adults, tuple(room.children)) for room in params.rooms),
+            tuple(params.program_filter or ()),
+        )
+        request = {
+            "rooms": template["rooms"],
+            "location": {
+                "geoLocation": {"latitude": params.latitude, "longitude": params.longitude},
+                "query": params.location_label,
+                "name": params.location_label,
+                "label": params.location_label,
+                "airportCode": "",
+                "type": "CITY",
+                "id": params.location_id,
+                "searchIdType": "LOCATION_ID",
             },
-            "searchType": "hotels",
+            "startDate": template["startDate"],
+            "endDate": template["endDate"],
+            "inavLocation": "hp-hotels",
+            "horizonsConfig": template["horizonsConfig"],
+            "inav": "us-travel-hp-hotels-search",
+            "accountToken": account_token,
         }
-        if enable_program_filter:
-            payload["request"]["filters"] = {
-                "clientProgramFilter": list(params.program_filter),
-            }
-        encoded = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
-        url = f"{SEARCH_REDIRECT_URL}?requestBody={quote_plus(encoded)}"
+        if "filters" in template:
+            request["filters"] = template["filters"]
+        payload = {"request": request, "searchType": "hotels"}
+        # The urlsafe alphabet needs no percent-encoding once padding is stripped.
+        encoded = _urlsafe_b64encode(dumps_bytes(payload)).rstrip(b"=").decode("ascii")
+        url = f"{SEARCH_REDIRECT_URL}?requestBody={encoded}"
         page = await self.context.new_page()
         logger.debug("Navigating to search redirect %s", url)
-        await page.route("**/*", self._inject_fetch_overrides)
         await page.goto(url, wait_until="domcontentloaded", timeout=60_000)
-        try:
-            await page.wait_for_load_state("networkidle", timeout=10_000)
-        except Exception:
-            logger.debug("Networkidle not reached after search redirect; continuing")
+        # Only the hop to the results page matters; the warm-up capture waits for its POST.
+        deadline = asyncio.get_running_loop().time() + REDIRECT_SETTLE_TIMEOUT_S
+        while not page.url.startswith(RESULTS_PAGE):
+            if asyncio.get_running_loop().time() >= deadline:
+                logger.debug("Search redirect did not reach the results page; continuing")
+                break
+            await asyncio.sleep(READY_STATE_POLL_SECONDS)
         logger.info("Search redirect landed at %s", page.url)
         return page
-
-    async def _inject_fetch_overrides(self, route, request) -> None:
-        await route.continue_()
@@ -5,49 +5,93 @@ import asyncio
 import hashlib
 import json
 import logging
+import re
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import chain, islice, zip_longest
+from operator import attrgetter, truth
 from pathlib import Path
-from typing import Any, Iterable, Sequence
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar
 
 from dataclasses import dataclass
 
 from secure_scraper.destinations.catalog import Destination
 from secure_scraper.tasks.search_payloads import RoomRequest, SearchParams
+from secure_scraper.utils.serialization import dumps
+
+_T = TypeVar("_T")
+# (rate snapshot values, nightly price rows, component rows) for one rate record.
+_RateEntry = tuple[tuple[Any, ...], list[tuple[Any, ...]], list[tuple[Any, ...]]]
 
 ISO_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
-SCHEMA_VERSION = 5
+SCHEMA_VERSION = 7
 
 VALID_JOURNAL_MODES = frozenset({"delete", "truncate", "persist", "memory", "wal", "off"})
 VALID_SYNCHRONOUS_MODES = frozenset({"off", "normal", "full", "extra"})
+STATEMENT_CACHE_SIZE = 256
+DEFAULT_CACHE_SIZE_KIB = 64 * 1024
+DEFAULT_MMAP_BYTES = 256 * 1024 * 1024
+# Records per write batch: save_hotels commits each batch on its own, save_rates
+# bounds each executemany round inside its single transaction.
+DEFAULT_WRITE_BATCH_SIZE = 500
+DEFAULT_READ_CONNECTIONS = 4
+# Seconds without writes before the writer folds the WAL back into the database.
+DEFAULT_IDLE_CHECKPOINT_SECONDS = 5.0
+
+# Column groups of a rate_snapshots row, in _UPSERT_RATE_SNAPSHOT_SQL order. Mapping
+# ``dict.get`` over them builds each group in C instead of one lookup per bytecode.
+_RATE_SUMMARY_KEYS = ("hotel_collection", "available")
+_RATE_FLAG_KEYS = (
+    "is_breakfast_included",
+    "is_food_beverage_credit",
+    "is_free_cancellation",
+    "is_parking_included",
+    "is_shuttle_included",
+)
+_RATE_OCCUPANCY_KEYS = ("occupancy_adults", "occupancy_children", "room_count")
+_RATE_PRICING_KEYS = (
+    "currency",
+    "base",
+    "total",
+    "total_inclusive",
+    "total_fees",
+    "total_taxes",
+    "average_nightly_rate",
+    "average_nightly_rate_points_burn",
+    "payment_model",
+    "points_burn",
+)
 
 
 def _utc_now() -> str:
-    return datetime.now(timezone.utc).strftime(ISO_FORMAT)
+    # Same text as strftime(ISO_FORMAT), but isoformat skips the format-string parser.
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds").replace("+00:00", "Z")
 
 
-def _json_dumps(value: Any) -> str:
-    return json.dumps(value, separators=(",", ":"), default=str)
+# Bound directly rather than wrapped so each JSON column costs a single call. Columns stay
+# TEXT (decoded from orjson's bytes) so json_extract() and readers keep working on them.
+_json_dumps: Callable[[Any], str] = dumps
 
 
 def _maybe_json(value: Any) -> str | None:
-    return _json_dumps(value) if value is not None else None
+    return dumps(value) if value is not None else None
 
 
-def _bool(value: Any) -> int:
-    return 1 if bool(value) else 0
+# operator.truth is a C builtin, so the flag columns skip a Python frame per value. sqlite3
+# binds the resulting bool as INTEGER 1/0, exactly what the old int-returning helper stored.
+_bool: Callable[[Any], bool] = truth
 
 
 def _sum_adults(rooms: Sequence[RoomRequest]) -> int:
-    return sum(getattr(room, "adults", 0) for room in rooms)
+    return sum(map(attrgetter("adults"), rooms))
 
 
 def _sum_children(rooms: Sequence[RoomRequest]) -> int:
-    total = 0
-    for room in rooms:
-        children = getattr(room, "children", [])
-        total += len(children or [])
-    return total
+    return sum(len(room.children) for room in rooms if room.children)
 
 
 def _extract_primary_description(entries: Sequence[dict[str, Any]] | None) -> tuple[str | None, str | None]:
@@ -64,11 +108,38 @@ def _extract_primary_description(entries: Sequence[dict[str, Any]] | None) -> tu
     return preferred.get("title"), preferred.get("description")
 
 
+_ISO_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}").fullmatch
+_date_fromisoformat = date.fromisoformat
+
+
+@contextmanager
+def _transaction(
+    conn: sqlite3.Connection, *, immediate: bool = True
+) -> Iterator[sqlite3.Connection]:
+    """Run the block in one explicit transaction on an autocommit connection.
+
+    Writers take the write lock up front with ``BEGIN IMMEDIATE``: a deferred
+    transaction that reads before it writes can hit SQLITE_BUSY when it later tries
+    to upgrade its lock under WAL, while taking the lock first waits on busy_timeout
+    instead. Readers that only touch temp tables pass ``immediate=False``.
+    """
+
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
 def _parse_date(value: str | None) -> date | None:
-    if not value:
+    # The shape check rejects garbage without paying for an exception; only
+    # well-shaped but impossible dates (e.g. 2025-02-30) still reach the except.
+    if not value or not _ISO_DATE(value):
         return None
     try:
-        return date.fromisoformat(value)
+        return _date_fromisoformat(value)
     except ValueError:
         return None
 
@@ -107,13 +178,42 @@ class SqliteStore:
         busy_timeout_ms: int = 2000,
         journal_mode: str | None = "wal",
         synchronous: str | None = "normal",
+        cache_size_kib: int | None = DEFAULT_CACHE_SIZE_KIB,
+        mmap_bytes: int | None = DEFAULT_MMAP_BYTES,
+        write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        read_connections: int = DEFAULT_READ_CONNECTIONS,
+        idle_checkpoint_seconds: float | None = DEFAULT_IDLE_CHECKPOINT_SECONDS,
     ) -> None:
         self._path = db_path
+        self._in_memory = str(db_path) == ":memory:"
         self._busy_timeout_ms = busy_timeout_ms
         self._journal_mode = self._normalize_journal_mode(journal_mode)
         self._synchronous = self._normalize_synchronous(synchronous)
+        self._cache_size_kib = self._normalize_size("cache_size_kib", cache_size_kib)
+        self._mmap_bytes = self._normalize_size("mmap_bytes", mmap_bytes)
+        if (
+            isinstance(write_batch_size, bool)
+            or not isinstance(write_batch_size, int)
+            or write_batch_size < 1
+        ):
+            raise ValueError(
+                f"Unsupported write_batch_size '{write_batch_size}'. Expected a positive integer"
+            )
+        self._write_batch_size = write_batch_size
+        self._read_connections = max(int(read_connections), 0)
+        self._idle_checkpoint_seconds = idle_checkpoint_seconds
+        self._checkpoint_handle: asyncio.TimerHandle | None = None
         self._connection: sqlite3.Connection | None = None
-        self._lock = asyncio.Lock()
+        self._schema_version = 0
+        # One worker owns every write, so operations run in submission order
+        # without an extra lock and the connection's statement cache stays warm.
+        self._executor: ThreadPoolExecutor | None = None
+        # In WAL mode lookups run on their own pool, one connection per worker
+        # thread, so they neither wait behind nor block the writer.
+        self._read_executor: ThreadPoolExecutor | None = None
+        self._reader_local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_guard = threading.Lock()
 
     # ------------------------------------------------------------------
     # lifecycle
@@ -121,27 +221,101 @@ class SqliteStore:
     async def initialize(self) -> None:
         if self._connection is not None:
             return
-        async with self._lock:
+
+        def _op() -> None:
             if self._connection is None:
-                conn = await asyncio.to_thread(self._open_connection)
-                self._connection = conn
+                self._connection = self._open_connection()
+
+        await self._run(_op)
 
     async def close(self) -> None:
         if self._connection is None:
             return
         conn = self._connection
         self._connection = None
-        await asyncio.to_thread(conn.close)
+        if self._checkpoint_handle is not None:
+            self._checkpoint_handle.cancel()
+            self._checkpoint_handle = None
+        read_executor, self._read_executor = self._read_executor, None
+        if read_executor is not None:
+            await asyncio.to_thread(read_executor.shutdown)
+        with self._readers_guard:
+            readers, self._readers = self._readers, []
+        self._reader_local = threading.local()
+        for reader in readers:
+            reader.close()
+        await self._run(conn.close)
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def _run(self, op: Callable[[], _T]) -> _T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-store")
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, op)
+        finally:
+            self._schedule_checkpoint(loop)
+
+    def _schedule_checkpoint(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Restart the idle timer that checkpoints the WAL once writes pause."""
+
+        if self._checkpoint_handle is not None:
+            self._checkpoint_handle.cancel()
+            self._checkpoint_handle = None
+        if (
+            self._idle_checkpoint_seconds is None
+            or self._journal_mode != "wal"
+            or self._in_memory
+            or self._connection is None
+        ):
+            return
+        self._checkpoint_handle = loop.call_later(
+            self._idle_checkpoint_seconds, self._submit_checkpoint
+        )
+
+    def _submit_checkpoint(self) -> None:
+        self._checkpoint_handle = None
+        if self._executor is not None and self._connection is not None:
+            self._executor.submit(self._checkpoint)
+
+    def _checkpoint(self) -> None:
+        # PASSIVE never waits on readers, so an idle checkpoint cannot stall lookups;
+        # doing it here keeps the cost off the next write's commit.
+        conn = self._connection
+        if conn is None:
+            return
+        try:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE);").fetchone()
+        except sqlite3.Error as exc:
+            logger.debug("Idle WAL checkpoint skipped (path=%s): %s", self._path, exc)
+
+    async def _read(self, op: Callable[[sqlite3.Connection], _T]) -> _T:
+        self._require_connection()
+        if self._journal_mode != "wal" or not self._read_connections or self._in_memory:
+            return await self._run(lambda: op(self._require_connection()))
+        if self._read_executor is None:
+            self._read_executor = ThreadPoolExecutor(
+                max_workers=self._read_connections, thread_name_prefix="sqlite-store-read"
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._read_executor, lambda: op(self._reader_connection())
+        )
+
+    def _reader_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._reader_local, "connection", None)
+        if conn is None:
+            conn = self._connect()
+            self._reader_local.connection = conn
+            with self._readers_guard:
+                self._readers.append(conn)
+        return conn
 
     def _open_connection(self) -> sqlite3.Connection:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(self._path, check_same_thread=False)
-        conn.execute("PRAGMA foreign_keys = ON;")
-        conn.execute(f"PRAGMA busy_timeout = {int(max(self._busy_timeout_ms, 0))};")
-        if self._journal_mode:
-            conn.execute(f"PRAGMA journal_mode = {self._journal_mode.upper()};")
-        if self._synchronous:
-            conn.execute(f"PRAGMA synchronous = {self._synchronous.upper()};")
+        if not self._in_memory:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
         try:
             self._apply_migrations(conn)
         except sqlite3.OperationalError as exc:
@@ -155,6 +329,30 @@ class SqliteStore:
             raise
         return conn
 
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: every write goes through _transaction, so the module's own
+        # statement sniffing and implicit BEGINs are pure overhead.
+        conn = sqlite3.connect(
+            self._path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.execute(f"PRAGMA busy_timeout = {int(max(self._busy_timeout_ms, 0))};")
+        # In-memory databases only support the MEMORY/OFF journal, so leave them alone.
+        if self._journal_mode and not self._in_memory:
+            conn.execute(f"PRAGMA journal_mode = {self._journal_mode.upper()};")
+        if self._synchronous:
+            conn.execute(f"PRAGMA synchronous = {self._synchronous.upper()};")
+        if self._cache_size_kib is not None:
+            # Negative values are read by SQLite as KiB rather than pages.
+            conn.execute(f"PRAGMA cache_size = {-self._cache_size_kib};")
+        if self._mmap_bytes is not None:
+            conn.execute(f"PRAGMA mmap_size = {self._mmap_bytes};")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        return conn
+
     @staticmethod
     def _normalize_journal_mode(value: str | None) -> str | None:
         if value is None:
@@ -181,32 +379,48 @@ class SqliteStore:
             )
         return mode
 
+    @staticmethod
+    def _normalize_size(name: str, value: int | None) -> int | None:
+        if value is None:
+            return None
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError(
+                f"Unsupported SQLite {name} '{value}'. Expected a non-negative integer"
+            )
+        return value
+
     def _apply_migrations(self, conn: sqlite3.Connection) -> None:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS meta (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL
-            );
-            """
-        )
-        current = self._get_schema_version(conn)
-        if current >= SCHEMA_VERSION:
+        # Reconnecting after close() skips the meta round-trips once this store has
+        # brought the file up to date.
+        if self._schema_version >= SCHEMA_VERSION:
             return
-        for version in range(current + 1, SCHEMA_VERSION + 1):
-            script = MIGRATIONS.get(version)
-            if not script:
-                raise RuntimeError(f"Missing migration script for version {version}")
-            conn.executescript(script)
-            conn.execute(
-                "INSERT INTO meta(key, value) VALUES('schema_version', ?)\n"
-                "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
-                (str(version),),
-            )
-        conn.commit()
+        if conn.execute(_SELECT_USER_VERSION_SQL).fetchone()[0] >= SCHEMA_VERSION:
+            self._schema_version = SCHEMA_VERSION
+            return
+        conn.execute(_CREATE_META_SQL)
+        current = self._get_schema_version(conn)
+        if current < SCHEMA_VERSION:
+            scripts = []
+            for version in range(current + 1, SCHEMA_VERSION + 1):
+                script = MIGRATIONS.get(version)
+                if not script:
+                    raise RuntimeError(f"Missing migration script for version {version}")
+                guard = MIGRATION_GUARDS.get(version)
+                if guard is None or guard(conn):
+                    scripts.append(script)
+            # One script and one transaction for every pending version, so a failure
+            # leaves the file at its previous version rather than half-migrated.
+            conn.executescript("BEGIN;\n" + "\n".join(scripts))
+            conn.execute(_UPSERT_SCHEMA_VERSION_SQL, (str(SCHEMA_VERSION),))
+            conn.execute(_SET_USER_VERSION_SQL)
+            conn.commit()
+        else:
+            # Migrated before user_version was tracked; record it for the next connect.
+            conn.execute(_SET_USER_VERSION_SQL)
+        self._schema_version = SCHEMA_VERSION
 
     def _get_schema_version(self, conn: sqlite3.Connection) -> int:
-        cursor = conn.execute("SELECT value FROM meta WHERE key='schema_version'")
+        cursor = conn.execute(_SELECT_SCHEMA_VERSION_SQL)
         row = cursor.fetchone()
         if not row:
             return 0
@@ -254,19 +468,9 @@ class SqliteStore:
             now = _utc_now()
             programs = list((params.program_filter or []))
             signature = self._signature(destination.key, label, params, programs)
-            with conn:
+            with _transaction(conn):
                 conn.execute(
-                    """
-                    INSERT INTO destinations(key, group_name, name, location_id, latitude, longitude, created_at, updated_at)
-                    VALUES(?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(key) DO UPDATE SET
-                        group_name=excluded.group_name,
-                        name=excluded.name,
-                        location_id=excluded.location_id,
-                        latitude=excluded.latitude,
-                        longitude=excluded.longitude,
-                        updated_at=excluded.updated_at
-                    """,
+                    _UPSERT_DESTINATION_SQL,
                     (
                         destination.key,
                         destination.group,
@@ -279,34 +483,11 @@ class SqliteStore:
                     ),
                 )
                 conn.execute(
-                    """
-                    UPDATE search_runs
-                    SET status='failed', failure_reason='Superseded by new run', updated_at=?
-                    WHERE search_signature=? AND status='running'
-                    """,
+                    _SUPERSEDE_RUNNING_RUNS_SQL,
                     (now, signature),
                 )
                 cursor = conn.execute(
-                    """
-                    INSERT INTO search_runs(
-                        destination_key,
-                        destination_group,
-                        destination_name,
-                        label,
-                        check_in,
-                        check_out,
-                        nights,
-                        adults,
-                        children,
-                        rooms,
-                        program_filter,
-                        status,
-                        started_at,
-                        created_at,
-                        updated_at,
-                        search_signature
-                    ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'running', ?, ?, ?, ?)
-                    """,
+                    _INSERT_SEARCH_RUN_SQL,
                     (
                         destination.key,
                         destination.group,
@@ -327,8 +508,7 @@ class SqliteStore:
                 )
                 return int(cursor.lastrowid)
 
-        async with self._lock:
-            return await asyncio.to_thread(_op)
+        return await self._run(_op)
 
     async def finalize_run(
         self,
@@ -338,29 +518,26 @@ class SqliteStore:
         total_rates: int,
         request_id: str | None,
         context: dict[str, Any] | None,
+        context_json: str | None = None,
     ) -> None:
+        """Mark ``run_id`` complete.
+
+        Pass ``context_json`` to reuse an already serialised context.
+        """
+
         def _op() -> None:
             conn = self._require_connection()
             now = _utc_now()
-            context_json = _json_dumps(context) if context else None
-            with conn:
+            context_blob = context_json
+            if context_blob is None and context:
+                context_blob = _json_dumps(context)
+            with _transaction(conn):
                 conn.execute(
-                    """
-                    UPDATE search_runs
-                    SET status='complete',
-                        completed_at=?,
-                        updated_at=?,
-                        total_hotels=?,
-                        total_rates=?,
-                        request_id=?,
-                        raw_context=?
-                    WHERE id=?
-                    """,
-                    (now, now, total_hotels, total_rates, request_id, context_json, run_id),
+                    _COMPLETE_RUN_SQL,
+                    (now, now, total_hotels, total_rates, request_id, context_blob, run_id),
                 )
 
-        async with self._lock:
-            await asyncio.to_thread(_op)
+        await self._run(_op)
 
     async def fetch_latest_run(
         self,
@@ -371,27 +548,14 @@ class SqliteStore:
     ) -> SearchRunRecord | None:
         signature = self._signature(destination.key, label, params, list(params.program_filter or []))
 
-        def _op() -> SearchRunRecord | None:
-            conn = self._require_connection()
-            cursor = conn.execute(
-                """
-                SELECT id, destination_key, destination_name, destination_group, label, status,
-                       started_at, updated_at, completed_at, failure_reason, total_hotels,
-                       total_rates, search_signature
-                FROM search_runs
-                WHERE search_signature=?
-                ORDER BY started_at DESC
-                LIMIT 1
-                """,
-                (signature,),
-            )
+        def _op(conn: sqlite3.Connection) -> SearchRunRecord | None:
+            cursor = conn.execute(_SELECT_LATEST_RUN_SQL, (signature,))
             row = cursor.fetchone()
             if not row:
                 return None
             return self._row_to_search_run(row)
 
-        async with self._lock:
-            return await asyncio.to_thread(_op)
+        return await self._read(_op)
 
     async def fetch_latest_runs_bulk(
         self,
@@ -404,97 +568,88 @@ class SqliteStore:
         if not runs:
             return {}
 
-        signatures: list[str] = []
+        # Insertion-ordered, so the keys double as the deduplicated signature list.
         signature_to_key: dict[str, str] = {}
         for destination, params in runs:
             programs = list(params.program_filter or [])
             signature = self._signature(destination.key, label, params, programs)
-            signatures.append(signature)
             signature_to_key.setdefault(signature, destination.key)
+        ordered_unique_signatures = signature_to_key.keys()
 
-        # Deduplicate while preserving order to keep parameter counts low.
-        ordered_unique_signatures = list(dict.fromkeys(signatures))
-
-        def _op() -> dict[str, SearchRunRecord]:
-            conn = self._require_connection()
+        def _op(conn: sqlite3.Connection) -> dict[str, SearchRunRecord]:
             records: dict[str, SearchRunRecord] = {}
-
-            def _query_chunk(chunk: Sequence[str]) -> None:
-                placeholders = ",".join("?" for _ in chunk)
-                cursor = conn.execute(
-                    f"""
-                    SELECT sr.id, sr.destination_key, sr.destination_name, sr.destination_group,
-                           sr.label, sr.status, sr.started_at, sr.updated_at, sr.completed_at,
-                           sr.failure_reason, sr.total_hotels, sr.total_rates, sr.search_signature
-                    FROM search_runs sr
-                    JOIN (
-                        SELECT search_signature, MAX(started_at) AS max_started_at
-                        FROM search_runs
-                        WHERE search_signature IN ({placeholders})
-                        GROUP BY search_signature
-                    ) latest ON sr.search_signature = latest.search_signature
-                            AND sr.started_at = latest.max_started_at
-                    """,
-                    chunk,
+            # A temp table keeps this to one prepared statement however many signatures
+            # there are; the transaction is committed so the reader holds no snapshot.
+            with _transaction(conn, immediate=False):
+                conn.execute(_CREATE_SIGNATURE_LOOKUP_SQL)
+                conn.executemany(
+                    _INSERT_SIGNATURE_LOOKUP_SQL,
+                    ((signature,) for signature in ordered_unique_signatures),
                 )
-                for row in cursor.fetchall():
-                    record = self._row_to_search_run(row)
-                    key = signature_to_key.get(record.search_signature)
-                    if key and key not in records:
-                        records[key] = record
-
-            chunk: list[str] = []
-            for signature in ordered_unique_signatures:
-                chunk.append(signature)
-                if len(chunk) >= self._SQLITE_PARAMETER_LIMIT:
-                    _query_chunk(tuple(chunk))
-                    chunk.clear()
-            if chunk:
-                _query_chunk(tuple(chunk))
+                rows = conn.execute(_SELECT_LATEST_RUNS_BY_LOOKUP_SQL).fetchall()
+                conn.execute(_CLEAR_SIGNATURE_LOOKUP_SQL)
+            for row in rows:
+                record = self._row_to_search_run(row)
+                key = signature_to_key.get(record.search_signature)
+                if key and key not in records:
+                    records[key] = record
             return records
 
-        async with self._lock:
-            return await asyncio.to_thread(_op)
+        return await self._read(_op)
 
     async def mark_run_failed(self, run_id: int, reason: str) -> None:
+        await self.mark_runs_failed((run_id,), reason)
+
+    async def mark_runs_failed(self, run_ids: Sequence[int], reason: str) -> None:
+        """Mark several runs failed with the same reason in one transaction."""
+
+        if not run_ids:
+            return
+
         def _op() -> None:
             conn = self._require_connection()
             now = _utc_now()
-            with conn:
-                conn.execute(
-                    """
-                    UPDATE search_runs
-                    SET status='failed', completed_at=?, updated_at=?, failure_reason=?
-                    WHERE id=?
-                    """,
-                    (now, now, reason[:512], run_id),
+            trimmed = reason[:512]
+            with _transaction(conn):
+                conn.executemany(
+                    _MARK_RUN_FAILED_SQL,
+                    [(now, now, trimmed, run_id) for run_id in run_ids],
                 )
 
-        async with self._lock:
-            await asyncio.to_thread(_op)
+        await self._run(_op)
 
     # ------------------------------------------------------------------
     # payload storage
 
-    async def store_run_payload(self, run_id: int, payload: dict[str, Any]) -> None:
+    async def store_run_payload(
+        self,
+        run_id: int,
+        payload: dict[str, Any],
+        *,
+        context_json: str | None = None,
+    ) -> None:
+        """Record the run's request id and context; ``context_json`` skips re-serialising it."""
+
         def _op() -> None:
             conn = self._require_connection()
             if not payload:
                 return
-            context = payload.get("context") if isinstance(payload.get("context"), dict) else None
+            context = payload.get("context")
+            # Payloads come straight from the JSON decoder, so an exact type check suffices.
+            if type(context) is not dict:
+                context = None
             request_id = context.get("requestId") if context else None
-            context_blob = _json_dumps(context) if context else None
+            context_blob = context_json
+            if context_blob is None and context:
+                context_blob = _json_dumps(context)
             now = _utc_now()
-            with conn:
+            with _transaction(conn):
                 conn.execute(
-                    """
-                    UPDATE search_runs SET request_id=?, raw_context=?, updated_at=? WHERE id=?
-                    """,
+                    _UPDATE_RUN_CONTEXT_SQL,
                     (_safe_str(request_id), context_blob, now, run_id),
                 )
 
-        async with self._lock:
-            await asyncio.to_thread(_op)
+        await self._run(_op)
 
     # ------------------------------------------------------------------
     # hotel persistence
@@ -503,129 +658,132 @@ class SqliteStore:
         def _op() -> None:
             conn = self._require_connection()
             now = _utc_now()
-            with conn:
-                for record in records:
-                    property_id = record.get("property_id")
-                    if not property_id:
-                        continue
-                    summary: dict[str, Any] = record.get("summary") or {}
-                    search_ctx = record.get("search")
-                    raw = record.get("raw")
-                    conn.execute(
-                        """
-                        INSERT INTO hotels(
-                            property_id,
-                            supplier_id,
-                            name,
-                            type,
-                            brand_name,
-                            chain_name,
-                            star_rating,
-                            phone,
-                            address_line1,
-                            address_city,
-                            address_state,
-                            address_postal_code,
-                            address_country_code,
-                            address_country_name,
-                            latitude,
-                            longitude,
-                            distance_miles,
-                            distance_unit,
-                            loyalty_valid,
-                            user_rating,
-                            user_rating_count,
-                            hero_image,
-                            marketing_insider_tip,
-                            marketing_video,
-                            location_teaser,
-                            renovation_closure_notice,
-                            check_in_start,
-                            check_in_end,
-                            check_out_time,
-                            summary_json,
-                            search_context_json,
-                            raw_json,
-                            created_at,
-                            updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(property_id) DO UPDATE SET
-                            supplier_id=excluded.supplier_id,
-                            name=excluded.name,
-                            type=excluded.type,
-                            brand_name=excluded.brand_name,
-                            chain_name=excluded.chain_name,
-                            star_rating=excluded.star_rating,
-                            phone=excluded.phone,
-                            address_line1=excluded.address_line1,
-                            address_city=excluded.address_city,
-                            address_state=excluded.address_state,
-                            address_postal_code=excluded.address_postal_code,
-                            address_country_code=excluded.address_country_code,
-                            address_country_name=excluded.address_country_name,
-                            latitude=excluded.latitude,
-                            longitude=excluded.longitude,
-                            distance_miles=excluded.distance_miles,
-                            distance_unit=excluded.distance_unit,
-                            loyalty_valid=excluded.loyalty_valid,
-                            user_rating=excluded.user_rating,
-                            user_rating_count=excluded.user_rating_count,
-                            hero_image=excluded.hero_image,
-                            marketing_insider_tip=excluded.marketing_insider_tip,
-                            marketing_video=excluded.marketing_video,
-                            location_teaser=excluded.location_teaser,
-                            renovation_closure_notice=excluded.renovation_closure_notice,
-                            check_in_start=excluded.check_in_start,
-                            check_in_end=excluded.check_in_end,
-                            check_out_time=excluded.check_out_time,
-                            summary_json=excluded.summary_json,
-                            search_context_json=excluded.search_context_json,
-                            raw_json=excluded.raw_json,
-                            updated_at=excluded.updated_at
-                        """,
-                        (
-                            property_id,
-                            record.get("supplier_id"),
-                            summary.get("name"),
-                            summary.get("type"),
-                            summary.get("brand_name"),
-                            summary.get("chain_name"),
-                            summary.get("star_rating"),
-                            summary.get("phone"),
-                            summary.get("address_line1"),
-                            summary.get("address_city"),
-                            summary.get("address_state"),
-                            summary.get("address_postal_code"),
-                            summary.get("address_country_code"),
-                            summary.get("address_country_name"),
-                            summary.get("latitude"),
-                            summary.get("longitude"),
-                            summary.get("distance_miles"),
-                            summary.get("distance_unit"),
-                            _bool(summary.get("loyalty_valid")),
-                            summary.get("user_rating"),
-                            summary.get("user_rating_count"),
-                            summary.get("hero_image"),
-                            summary.get("marketing_insider_tip"),
-                            summary.get("marketing_video"),
-                            summary.get("location_teaser"),
-                            summary.get("renovation_closure_notice"),
-                            summary.get("check_in_start"),
-                            summary.get("check_in_end"),
-                            summary.get("check_out_time"),
-                            _json_dumps(summary),
-                            _maybe_json(search_ctx),
-                            _maybe_json(raw),
-                            now,
-                            now,
-                        ),
-                    )
-                    self._upsert_hotel_features(conn, property_id, summary)
-                    self._upsert_program_benefits(conn, property_id, summary.get("program_benefits") or [])
-        async with self._lock:
-            await asyncio.to_thread(_op)
+            # Commit in bounded batches so a large destination neither holds one huge
+            # transaction open nor stages every row tuple in memory at once.
+            pending = iter(records)
+            while batch := list(islice(pending, self._write_batch_size)):
+                self._write_hotel_batch(conn, batch, now)
+
+        await self._run(_op)
+
+    def _write_hotel_batch(
+        self, conn: sqlite3.Connection, records: list[dict[str, Any]], now: str
+    ) -> None:
+        hotel_rows: list[tuple[Any, ...]] = []
+        # Keyed by property so a repeated hotel keeps only its last feature set,
+        # as the per-record delete-then-insert used to.
+        feature_rows: dict[str, list[tuple[Any, ...]]] = {}
+        benefit_rows: dict[str, list[tuple[Any, ...]]] = {}
+        for record in records:
+            property_id = record.get("property_id")
+            if not property_id:
+                continue
+            summary: dict[str, Any] = record.get("summary") or {}
+            hotel_rows.append(
+                (
+                    property_id,
+                    record.get("supplier_id"),
+                    summary.get("name"),
+                    summary.get("type"),
+                    summary.get("brand_name"),
+                    summary.get("chain_name"),
+                    summary.get("star_rating"),
+                    summary.get("phone"),
+                    summary.get("address_line1"),
+                    summary.get("address_city"),
+                    summary.get("address_state"),
+                    summary.get("address_postal_code"),
+                    summary.get("address_country_code"),
+                    summary.get("address_country_name"),
+                    summary.get("latitude"),
+                    summary.get("longitude"),
+                    summary.get("distance_miles"),
+                    summary.get("distance_unit"),
+                    _bool(summary.get("loyalty_valid")),
+                    summary.get("user_rating"),
+                    summary.get("user_rating_count"),
+                    summary.get("hero_image"),
+                    summary.get("marketing_insider_tip"),
+                    summary.get("marketing_video"),
+                    summary.get("location_teaser"),
+                    summary.get("renovation_closure_notice"),
+                    summary.get("check_in_start"),
+                    summary.get("check_in_end"),
+                    summary.get("check_out_time"),
+                    _json_dumps(summary),
+                    _maybe_json(record.get("search")),
+                    _maybe_json(record.get("raw")),
+                    now,
+                    now,
+                )
+            )
+            feature_rows[property_id] = self._hotel_feature_rows(property_id, summary)
+            benefit_rows[property_id] = self._program_benefit_rows(
+                property_id, summary.get("program_benefits") or []
+            )
+        if not hotel_rows:
+            return
+
+        with _transaction(conn):
+            conn.executemany(
+                _UPSERT_HOTEL_SQL,
+                hotel_rows,
+            )
+            self._sync_hotel_features(conn, feature_rows)
+            self._sync_program_benefits(conn, benefit_rows)
+
+    def _sync_hotel_features(
+        self, conn: sqlite3.Connection, rows_by_property: dict[str, list[tuple[Any, ...]]]
+    ) -> None:
+        """Write only the feature rows that were added or dropped since the last save."""
 
-    def _upsert_hotel_features(self, conn: sqlite3.Connection, property_id: str, summary: dict[str, Any]) -> None:
+        wanted = set(chain.from_iterable(rows_by_property.values()))
+        current = set(
+            self._select_for_properties(conn, _SELECT_HOTEL_FEATURES_SQL, rows_by_property)
+        )
+        stale = current - wanted
+        if stale:
+            conn.executemany(_DELETE_HOTEL_FEATURE_SQL, stale)
+        added = wanted - current
+        if added:
+            conn.executemany(_INSERT_HOTEL_FEATURE_SQL, added)
+
+    def _sync_program_benefits(
+        self, conn: sqlite3.Connection, rows_by_property: dict[str, list[tuple[Any, ...]]]
+    ) -> None:
+        """Rewrite the benefits of properties whose list differs from what is stored."""
+
+        # Benefit rows have no natural key, so the diff is per property rather than per row.
+        current: dict[str, list[tuple[Any, ...]]] = {}
+        for row in self._select_for_properties(
+            conn, _SELECT_PROGRAM_BENEFITS_SQL, rows_by_property
+        ):
+            current.setdefault(row[0], []).append(row)
+        changed = [
+            property_id
+            for property_id, rows in rows_by_property.items()
+            if current.get(property_id, []) != rows
+        ]
+        if not changed:
+            return
+        conn.executemany(_DELETE_PROGRAM_BENEFITS_SQL, [(property_id,) for property_id in changed])
+        conn.executemany(
+            _INSERT_PROGRAM_BENEFIT_SQL,
+            chain.from_iterable(rows_by_property[property_id] for property_id in changed),
+        )
+
+    def _select_for_properties(
+        self, conn: sqlite3.Connection, sql: str, property_ids: Iterable[str]
+    ) -> Iterator[tuple[Any, ...]]:
+        ids = list(property_ids)
+        for start in range(0, len(ids), self._SQLITE_PARAMETER_LIMIT):
+            chunk = ids[start : start + self._SQLITE_PARAMETER_LIMIT]
+            placeholders = ",".join("?" for _ in chunk)
+            yield from conn.execute(sql.format(placeholders=placeholders), chunk)
+
+    def _hotel_feature_rows(
+        self, property_id: str, summary: dict[str, Any]
+    ) -> list[tuple[Any, ...]]:
         buckets = {
             "interest": summary.get("interests") or [],
             "amenity": summary.get("amenities") or [],
@@ -636,23 +794,17 @@ class SqliteStore:
             "policy": summary.get("policies") or [],
             "supplier_fee": summary.get("supplier_fees") or [],
         }
-        conn.execute("DELETE FROM hotel_features WHERE property_id=?", (property_id,))
         rows = []
         for feature_type, values in buckets.items():
             for value in values:
                 if not value:
                     continue
                 rows.append((property_id, feature_type, str(value)))
-        if rows:
-            conn.executemany(
-                "INSERT OR IGNORE INTO hotel_features(property_id, feature_type, value) VALUES(?, ?, ?)",
-                rows,
-            )
+        return rows
 
-    def _upsert_program_benefits(
-        self, conn: sqlite3.Connection, property_id: str, benefits: list[dict[str, Any]]
-    ) -> None:
-        conn.execute("DELETE FROM hotel_program_benefits WHERE property_id=?", (property_id,))
+    def _program_benefit_rows(
+        self, property_id: str, benefits: list[dict[str, Any]]
+    ) -> list[tuple[Any, ...]]:
         rows = []
         for benefit in benefits:
             rows.append(
@@ -668,23 +820,7 @@ class SqliteStore:
                     _bool(benefit.get("exceptional_value")),
                 )
             )
-        if rows:
-            conn.executemany(
-                """
-                INSERT INTO hotel_program_benefits(
-                    property_id,
-                    program_code,
-                    program_name,
-                    benefit_type,
-                    description,
-                    note,
-                    start_date,
-                    end_date,
-                    exceptional_value
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                rows,
-            )
+        return rows
 
     # ------------------------------------------------------------------
     # rates persistence
@@ -694,9 +830,19 @@ class SqliteStore:
             conn = self._require_connection()
             now = _utc_now()
             room_types: dict[tuple[str, str], dict[str, Any]] = {}
-            rate_entries: list[tuple[tuple[Any, ...], list[tuple[Any, ...]], list[tuple[Any, ...]]]] = []
+            rate_entries: list[_RateEntry] = []
+            # First special offer seen per (property, promotion code); rows are built once at
+            # write time.
             promotions: dict[tuple[str, str], dict[str, Any]] = {}
-            seen_snapshots: set[tuple[str, str, str]] = set()
+            # One joined string hashes and compares faster than a 3-tuple of strings.
+            seen_snapshots: set[str] = set()
+            # Every rate of a run normally shares one check-in, so format its nights once.
+            night_dates: dict[Any, list[str]] = {}
+            summary_cache: dict[int, tuple[Any, str]] = {}
+            # Each record carries its own copy of the same search context, so only
+            # re-encode it when the value actually changes.
+            last_search_ctx: dict[str, Any] | None = None
+            search_ctx_json = ""
 
             for record in records:
                 property_id = record.get("property_id")
@@ -704,7 +850,7 @@ class SqliteStore:
                     continue
                 summary: dict[str, Any] = record.get("summary") or {}
                 pricing: dict[str, Any] = summary.get("pricing") or {}
-                room_type_id = self._resolve_room_type_id(record)
+                room_type_id = self._resolve_room_type_id(record, summary_cache)
                 key = (property_id, room_type_id)
                 entry = room_types.setdefault(
                     key,
@@ -722,9 +868,10 @@ class SqliteStore:
                     entry["raw"] = record.get("raw")
 
                 search_ctx = record.get("search") or {}
-                rate_identifier = self._resolve_rate_id(record, room_type_id)
-                rate_identifier = self._resolve_rate_id(record, room_type_id)
-                rate_key = (property_id, room_type_id, rate_identifier)
+                if search_ctx != last_search_ctx:
+                    last_search_ctx, search_ctx_json = search_ctx, _json_dumps(search_ctx)
+                rate_identifier = self._resolve_rate_id(record, room_type_id, summary_cache)
+                rate_key = f"{property_id}\x1f{room_type_id}\x1f{rate_identifier}"
                 if rate_key in seen_snapshots:
                     continue
                 seen_snapshots.add(rate_key)
@@ -734,327 +881,322 @@ class SqliteStore:
                     property_id,
                     room_type_id,
                     rate_identifier,
-                    summary.get("hotel_collection"),
-                    summary.get("available"),
-                    _bool(summary.get("is_breakfast_included")),
-                    _bool(summary.get("is_food_beverage_credit")),
-                    _bool(summary.get("is_free_cancellation")),
-                    _bool(summary.get("is_parking_included")),
-                    _bool(summary.get("is_shuttle_included")),
-                    record.get("occupancy_adults"),
-                    record.get("occupancy_children"),
-                    record.get("room_count"),
-                    pricing.get("currency"),
-                    pricing.get("base"),
-                    pricing.get("total"),
-                    pricing.get("total_inclusive"),
-                    pricing.get("total_fees"),
-                    pricing.get("total_taxes"),
-                    pricing.get("average_nightly_rate"),
-                    pricing.get("average_nightly_rate_points_burn"),
-                    pricing.get("payment_model"),
-                    pricing.get("points_burn"),
-                    _maybe_json(pricing.get("points_burn_calculation")),
-                    _maybe_json(summary.get("room_allocations")),
-                    _maybe_json(record.get("special_offer")),
-                    _maybe_json(record.get("supplier_rate_promotion")),
-                    _maybe_json(record.get("comparison_amenity")),
-                    _json_dumps(search_ctx),
+                    *map(summary.get, _RATE_SUMMARY_KEYS),
+                    *map(_bool, map(summary.get, _RATE_FLAG_KEYS)),
+                    *map(record.get, _RATE_OCCUPANCY_KEYS),
+                    *map(pricing.get, _RATE_PRICING_KEYS),
+                    # _maybe_json inlined: these are usually None, so skip the call entirely.
+                    None
+                    if (burn := pricing.get("points_burn_calculation")) is None
+                    else _json_dumps(burn),
+                    None
+                    if (allocations := summary.get("room_allocations")) is None
+                    else _json_dumps(allocations),
+                    None
+                    if (special_offer := record.get("special_offer")) is None
+                    else _json_dumps(special_offer),
+                    None
+                    if (supplier := record.get("supplier_rate_promotion")) is None
+                    else _json_dumps(supplier),
+                    None
+                    if (amenity := record.get("comparison_amenity")) is None
+                    else _json_dumps(amenity),
+                    search_ctx_json,
                     now,
                 )
 
+                nightly_actual = pricing.get("nightly_actual_rates") or []
+                nightly_inclusive = pricing.get("nightly_inclusive_rates") or []
                 nightly_rows = self._build_nightly_rows(
-                    pricing.get("nightly_actual_rates") or [],
-                    pricing.get("nightly_inclusive_rates") or [],
-                    search_ctx,
+                    nightly_actual,
+                    nightly_inclusive,
+                    self._night_dates(
+                        night_dates,
+                        search_ctx.get("check_in"),
+                        max(len(nightly_actual), len(nightly_inclusive)),
+                    ),
                 )
                 component_rows = []
                 component_rows.extend(self._build_component_rows(pricing.get("fees") or [], "fee"))
                 component_rows.extend(self._build_component_rows(pricing.get("taxes") or [], "tax"))
                 rate_entries.append((values, nightly_rows, component_rows))
 
-                special_offer = record.get("special_offer")
                 if isinstance(special_offer, dict):
                     promotion_code = special_offer.get("promotionCode")
                     if promotion_code:
-                        key = (property_id, promotion_code)
-                        if key not in promotions:
-                            title_text, description_text = _extract_primary_description(
-                                special_offer.get("descriptions")
-                            )
-                            promotions[key] = {
-                                "property_id": property_id,
-                                "promotion_code": promotion_code,
-                                "promotion_type": special_offer.get("type"),
-                                "title": special_offer.get("title") or title_text,
-                                "description": description_text,
-                                "min_nights": special_offer.get("minNights"),
-                                "max_nights": special_offer.get("maxNights"),
-                                "booking_start": special_offer.get("bookingStartDate"),
-                                "booking_end": special_offer.get("bookingEndDate"),
-                                "stay_start": special_offer.get("stayStartDate"),
-                                "stay_end": special_offer.get("stayEndDate"),
-                                "blackout_dates": special_offer.get("blackoutDates"),
-                                "card_types": special_offer.get("cardTypes"),
-                                "raw": special_offer,
-                            }
-
-            with conn:
-                for (property_id, room_type_id), meta in room_types.items():
-                    conn.execute(
-                        """
-                        INSERT INTO room_types(
-                            property_id,
-                            room_type_id,
-                            name,
-                            amenities_json,
-                            bed_groups_json,
-                            raw_json,
-                            created_at,
-                            updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(property_id, room_type_id) DO UPDATE SET
-                            name=excluded.name,
-                            amenities_json=excluded.amenities_json,
-                            bed_groups_json=excluded.bed_groups_json,
-                            raw_json=excluded.raw_json,
-                            updated_at=excluded.updated_at
-                        """,
-                        (
-                            property_id,
-                            room_type_id,
-                            meta.get("name"),
-                            _json_dumps(sorted(meta.get("amenities") or [])),
-                            _json_dumps(meta.get("bed_groups")),
-                            _json_dumps(meta.get("raw")),
-                            now,
-                            now,
-                        ),
-                    )
+                        promotions.setdefault((property_id, promotion_code), special_offer)
 
-                # Replace snapshots for this execution before inserting fresh rows.
-                conn.execute("DELETE FROM rate_snapshots WHERE run_id=?", (run_id,))
-                for values, nightly_rows, component_rows in rate_entries:
-                    placeholder_clause = ", ".join(["?"] * len(values))
-                    cursor = conn.execute(
-                        """
-                        INSERT INTO rate_snapshots(
-                            run_id,
-                            property_id,
-                            room_type_id,
-                            rate_id,
-                            hotel_collection,
-                            available,
-                            is_breakfast_included,
-                            is_food_beverage_credit,
-                            is_free_cancellation,
-                            is_parking_included,
-                            is_shuttle_included,
-                            occupancy_adults,
-                            occupancy_children,
-                            room_count,
-                            pricing_currency,
-                            pricing_base,
-                            pricing_total,
-                            pricing_total_inclusive,
-                            pricing_total_fees,
-                            pricing_total_taxes,
-                            average_nightly_rate,
-                            average_nightly_rate_points_burn,
-                            payment_model,
-                            points_burn,
-                            points_burn_calculation_json,
-                            room_allocations_json,
-                            special_offer_json,
-                            supplier_rate_promotion_json,
-                            comparison_amenity_json,
-                            search_context_json,
-                            created_at
-                        ) VALUES (PLACEHOLDERS)
-                        """.replace("PLACEHOLDERS", placeholder_clause),
-                        values,
+            # Room types merge across records, so their rows (and JSON) are built once all
+            # records are in, before the write lock is taken.
+            room_type_rows = [
+                (
+                    property_id,
+                    room_type_id,
+                    meta["name"],
+                    _json_dumps(sorted(meta["amenities"])),
+                    _json_dumps(meta["bed_groups"]),
+                    _json_dumps(meta["raw"]),
+                    now,
+                    now,
+                )
+                for (property_id, room_type_id), meta in room_types.items()
+            ]
+
+            # Room types, promotions and the run's snapshots are replaced as one unit, so
+            # readers never see a run with only part of its rates.
+            with _transaction(conn):
+                if room_type_rows:
+                    conn.executemany(_UPSERT_ROOM_TYPE_SQL, room_type_rows)
+
+                self._upsert_promotions(conn, promotions, now)
+
+                # Snapshots are upserted on their UNIQUE key, so re-saving a run keeps the
+                # rows it already has; only rates that disappeared are deleted outright.
+                snapshot_ids = self._prune_run_snapshots(conn, run_id, rate_entries)
+
+                batch_size = self._write_batch_size
+                for start in range(0, len(rate_entries), batch_size):
+                    self._insert_rate_snapshots(
+                        conn, rate_entries[start : start + batch_size], snapshot_ids
                     )
-                    snapshot_id = cursor.lastrowid
-                    if nightly_rows:
-                        conn.executemany(
-                            """
-                            INSERT INTO rate_nightly_prices(
-                                rate_snapshot_id,
-                                night_index,
-                                night_date,
-                                actual_rate,
-                                inclusive_rate
-                            ) VALUES (?, ?, ?, ?, ?)
-                            """,
-                            [(snapshot_id, *row) for row in nightly_rows],
-                        )
-                    if component_rows:
-                        conn.executemany(
-                            """
-                            INSERT INTO rate_components(
-                                rate_snapshot_id,
-                                component_type,
-                                code,
-                                label,
-                                amount,
-                                currency,
-                                is_included,
-                                pay_locally,
-                                details_json
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
-                            [(snapshot_id, *row) for row in component_rows],
-                        )
-
-                self._upsert_promotions(conn, promotions.values(), now)
-
-        async with self._lock:
-            await asyncio.to_thread(_op)
+
+        await self._run(_op)
+
+    def _prune_run_snapshots(
+        self,
+        conn: sqlite3.Connection,
+        run_id: int,
+        rate_entries: Sequence[_RateEntry],
+    ) -> dict[tuple[str, str, str], int]:
+        """Drop the run's snapshots missing from ``rate_entries`` and the children of the rest.
+
+        Returns the ids of the surviving snapshots by (property_id, room_type_id, rate_id).
+        """
+
+        existing = {
+            (str(property_id), room_type_id, rate_id): snapshot_id
+            for snapshot_id, property_id, room_type_id, rate_id in conn.execute(
+                _SELECT_RUN_SNAPSHOT_KEYS_SQL, (run_id,)
+            )
+        }
+        if not existing:
+            return existing
+        wanted = {(str(values[1]), values[2], values[3]) for values, _, _ in rate_entries}
+        stale = [(existing.pop(key),) for key in existing.keys() - wanted]
+        if stale:
+            conn.executemany(_DELETE_RATE_SNAPSHOT_SQL, stale)
+        # Nightly prices and components are rewritten wholesale for the snapshots that remain.
+        conn.execute(_DELETE_RUN_NIGHTLY_PRICES_SQL, (run_id,))
+        conn.execute(_DELETE_RUN_RATE_COMPONENTS_SQL, (run_id,))
+        return existing
+
+    def _insert_rate_snapshots(
+        self,
+        conn: sqlite3.Connection,
+        rate_entries: Sequence[_RateEntry],
+        snapshot_ids: dict[tuple[str, str, str], int],
+    ) -> None:
+        # sqlite3 discards RETURNING rows under executemany, so ids are derived instead.
+        # AUTOINCREMENT hands out consecutive ids and this transaction is the only writer.
+        keys = [(str(values[1]), values[2], values[3]) for values, _, _ in rate_entries]
+        if snapshot_ids.keys().isdisjoint(keys):
+            # Every row is a fresh insert, so the batch owns the id range ending at the
+            # last inserted rowid.
+            conn.executemany(_UPSERT_RATE_SNAPSHOT_SQL, [values for values, _, _ in rate_entries])
+            last_id = conn.execute(_LAST_INSERT_ROWID_SQL).fetchone()[0]
+            entry_ids = list(range(last_id - len(keys) + 1, last_id + 1))
+            snapshot_ids.update(zip(keys, entry_ids, strict=True))
+        else:
+            # Upserted rows keep the ids already in ``snapshot_ids``; the ones inserted
+            # here are exactly those above ``floor``.
+            floor = conn.execute(_MAX_RATE_SNAPSHOT_ID_SQL).fetchone()[0]
+            conn.executemany(_UPSERT_RATE_SNAPSHOT_SQL, [values for values, _, _ in rate_entries])
+            snapshot_ids.update(
+                ((str(property_id), room_type_id, rate_id), snapshot_id)
+                for snapshot_id, property_id, room_type_id, rate_id in conn.execute(
+                    _SELECT_RATE_SNAPSHOT_KEYS_SQL, (floor,)
+                )
+            )
+            entry_ids = [snapshot_ids[key] for key in keys]
+        # executemany consumes the flattened children lazily; an empty stream is a no-op.
+        conn.executemany(
+            _INSERT_NIGHTLY_PRICE_SQL,
+            chain.from_iterable(
+                [(snapshot_id, *row) for row in nightly]
+                for snapshot_id, (_, nightly, _) in zip(entry_ids, rate_entries, strict=True)
+            ),
+        )
+        conn.executemany(
+            _INSERT_RATE_COMPONENT_SQL,
+            chain.from_iterable(
+                [(snapshot_id, *row) for row in components]
+                for snapshot_id, (_, _, components) in zip(
+                    entry_ids, rate_entries, strict=True
+                )
+            ),
+        )
 
     def _build_nightly_rows(
         self,
         nightly_actual: Sequence[float],
         nightly_inclusive: Sequence[float],
-        search_ctx: dict[str, Any],
+        night_dates: Sequence[str],
     ) -> list[tuple[Any, ...]]:
-        rows: list[tuple[Any, ...]] = []
-        check_in = _parse_date(search_ctx.get("check_in"))
-        if nightly_actual or nightly_inclusive:
-            for idx, (actual, inclusive) in enumerate(_zip_longest(nightly_actual, nightly_inclusive)):
-                night_date = (check_in + timedelta(days=idx)).isoformat() if check_in else None
-                rows.append((idx, night_date, actual, inclusive))
-        return rows
+        known = len(night_dates)
+        return [
+            (idx, night_dates[idx] if idx < known else None, actual, inclusive)
+            for idx, (actual, inclusive) in enumerate(
+                zip_longest(nightly_actual, nightly_inclusive)
+            )
+        ]
+
+    def _night_dates(
+        self, cache: dict[Any, list[str]], check_in_value: Any, count: int
+    ) -> list[str]:
+        """Return ISO dates for ``count`` nights from ``check_in_value``, reusing ``cache``."""
+
+        dates = cache.get(check_in_value)
+        if dates is None or len(dates) < count:
+            check_in = _parse_date(check_in_value)
+            dates = (
+                [(check_in + timedelta(days=idx)).isoformat() for idx in range(count)]
+                if check_in
+                else []
+            )
+            cache[check_in_value] = dates
+        return dates
 
     def _build_component_rows(self, components: Sequence[dict[str, Any]], kind: str) -> list[tuple[Any, ...]]:
         rows: list[tuple[Any, ...]] = []
         for component in components:
-            included = component.get("isIncluded")
+            get = component.get
+            included = get("isIncluded")
             if included is None:
-                included = component.get("is_included")
-            pay_locally = component.get("payLocally")
+                included = get("is_included")
+            pay_locally = get("payLocally")
             if pay_locally is None:
-                pay_locally = component.get("pay_locally")
+                pay_locally = get("pay_locally")
             rows.append(
                 (
                     kind,
-                    component.get("type"),
-                    component.get("description")
-                    or component.get("label")
-                    or component.get("name"),
-                    component.get("value") or component.get("amount"),
-                    component.get("currency"),
+                    get("type"),
+                    get("description") or get("label") or get("name"),
+                    get("value") or get("amount"),
+                    get("currency"),
                     _bool(included),
                     _bool(pay_locally),
                     _json_dumps(component),
                 )
-                )
+            )
         return rows
 
     def _upsert_promotions(
         self,
         conn: sqlite3.Connection,
-        promotions: Iterable[dict[str, Any]],
+        promotions: dict[tuple[str, str], dict[str, Any]],
         timestamp: str,
     ) -> None:
         promo_rows: list[tuple[Any, ...]] = []
-        for promo in promotions:
+        for (property_id, promotion_code), offer in promotions.items():
+            title_text, description_text = _extract_primary_description(offer.get("descriptions"))
             promo_rows.append(
                 (
-                    promo.get("property_id"),
-                    promo.get("promotion_code"),
-                    promo.get("promotion_type"),
-                    promo.get("title"),
-                    promo.get("description"),
-                    promo.get("min_nights"),
-                    promo.get("max_nights"),
-                    promo.get("booking_start"),
-                    promo.get("booking_end"),
-                    promo.get("stay_start"),
-                    promo.get("stay_end"),
-                    _maybe_json(promo.get("blackout_dates")),
-                    _maybe_json(promo.get("card_types")),
-                    _json_dumps(promo.get("raw")),
+                    property_id,
+                    promotion_code,
+                    offer.get("type"),
+                    offer.get("title") or title_text,
+                    description_text,
+                    offer.get("minNights"),
+                    offer.get("maxNights"),
+                    offer.get("bookingStartDate"),
+                    offer.get("bookingEndDate"),
+                    offer.get("stayStartDate"),
+                    offer.get("stayEndDate"),
+                    _maybe_json(offer.get("blackoutDates")),
+                    _maybe_json(offer.get("cardTypes")),
+                    _json_dumps(offer),
                     timestamp,
                     timestamp,
                 )
             )
         if not promo_rows:
             return
-        conn.executemany(
-            """
-            INSERT INTO hotel_promotions(
-                property_id,
-                promotion_code,
-                promotion_type,
-                title,
-                description,
-                min_nights,
-                max_nights,
-                booking_start,
-                booking_end,
-                stay_start,
-                stay_end,
-                blackout_dates_json,
-                card_types_json,
-                raw_json,
-                first_seen,
-                last_seen
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(property_id, promotion_code) DO UPDATE SET
-                promotion_type=excluded.promotion_type,
-                title=COALESCE(excluded.title, hotel_promotions.title),
-                description=COALESCE(excluded.description, hotel_promotions.description),
-                min_nights=excluded.min_nights,
-                max_nights=excluded.max_nights,
-                booking_start=excluded.booking_start,
-                booking_end=excluded.booking_end,
-                stay_start=excluded.stay_start,
-                stay_end=excluded.stay_end,
-                blackout_dates_json=excluded.blackout_dates_json,
-                card_types_json=excluded.card_types_json,
-                raw_json=excluded.raw_json,
-                last_seen=excluded.last_seen
-            """,
-            promo_rows,
-        )
+        conn.executemany(_UPSERT_PROMOTION_SQL, promo_rows)
 
 
-    def _resolve_room_type_id(self, record: dict[str, Any]) -> str:
+    def _resolve_room_type_id(
+        self, record: dict[str, Any], summary_cache: dict[int, tuple[Any, str]]
+    ) -> str:
         room_type_id = record.get("room_type_id")
         if room_type_id:
             return str(room_type_id)
-        payload = f"{record.get('property_id','')}|{record.get('room_type_name','')}|{json.dumps(record.get('summary') or {}, sort_keys=True)}"
+        summary_json = _canonical_summary(summary_cache, record.get("summary"))
+        payload = f"{record.get('property_id','')}|{record.get('room_type_name','')}|{summary_json}"
         return f"anon_{hashlib.sha1(payload.encode()).hexdigest()[:12]}"
 
-    def _resolve_rate_id(self, record: dict[str, Any], room_type_id: str) -> str:
+    def _resolve_rate_id(
+        self, record: dict[str, Any], room_type_id: str, summary_cache: dict[int, tuple[Any, str]]
+    ) -> str:
         rate_id = record.get("rate_id")
         if rate_id:
             return str(rate_id)
-        payload = json.dumps(
-            {
-                "property_id": record.get("property_id"),
-                "room_type_id": room_type_id,
-                "summary": record.get("summary") or {},
-            },
-            sort_keys=True,
-            default=str,
+        # Spelled-out form of json.dumps({"property_id", "room_type_id", "summary"},
+        # sort_keys=True, default=str), so the summary's canonical JSON can be shared
+        # with _resolve_room_type_id and existing anonymous ids stay stable.
+        payload = (
+            f'{{"property_id": {json.dumps(record.get("property_id"), default=str)}, '
+            f'"room_type_id": {json.dumps(room_type_id)}, '
+            f'"summary": {_canonical_summary(summary_cache, record.get("summary"))}}}'
         )
         digest = hashlib.sha1(payload.encode()).hexdigest()[:12]
         return f"rate_{digest}"
 
     def _signature(self, destination_key: str, label: str | None, params: SearchParams, programs: list[str]) -> str:
-        payload = "|".join(
-            (
-                destination_key,
-                label or "",
-                params.check_in.isoformat(),
-                params.check_out.isoformat(),
-                str(len(params.rooms)),
-                str(_sum_adults(params.rooms)),
-                ",".join(sorted(programs)),
-            )
+        return _run_signature(
+            destination_key,
+            label,
+            params.check_in,
+            params.check_out,
+            len(params.rooms),
+            _sum_adults(params.rooms),
+            tuple(programs),
         )
-        return hashlib.sha1(payload.encode()).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _run_signature(
+    destination_key: str,
+    label: str | None,
+    check_in: date,
+    check_out: date,
+    rooms: int,
+    adults: int,
+    programs: tuple[str, ...],
+) -> str:
+    payload = "|".join(
+        (
+            destination_key,
+            label or "",
+            check_in.isoformat(),
+            check_out.isoformat(),
+            str(rooms),
+            str(adults),
+            ",".join(sorted(programs)),
+        )
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _canonical_summary(cache: dict[int, tuple[Any, str]], summary: dict[str, Any] | None) -> str:
+    """Return ``summary`` as sorted-key JSON, serialising each dict at most once per ``cache``."""
+
+    if not summary:
+        return "{}"
+    # The cached entry keeps ``summary`` alive, so its id cannot be reused by another dict.
+    entry = cache.get(id(summary))
+    if entry is None:
+        entry = cache[id(summary)] = (summary, json.dumps(summary, sort_keys=True, default=str))
+    return entry[1]
 
 
 def _safe_str(value: Any) -> str | None:
@@ -1063,15 +1205,404 @@ def _safe_str(value: Any) -> str | None:
     return str(value)
 
 
-def _zip_longest(left: Sequence[Any], right: Sequence[Any]) -> list[tuple[Any, Any]]:
-    length = max(len(left), len(right))
-    rows: list[tuple[Any, Any]] = []
-    for idx in range(length):
-        a = left[idx] if idx < len(left) else None
-        b = right[idx] if idx < len(right) else None
-        rows.append((a, b))
-    return rows
-
+# Statements are kept as module constants so every call hands sqlite3 the same
+# string object and hits its prepared-statement cache.
+
+_CREATE_META_SQL = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+"""
+
+_SELECT_SCHEMA_VERSION_SQL = "SELECT value FROM meta WHERE key='schema_version'"
+
+_UPSERT_SCHEMA_VERSION_SQL = """
+    INSERT INTO meta(key, value) VALUES('schema_version', ?)
+    ON CONFLICT(key) DO UPDATE SET value=excluded.value
+"""
+
+# Mirrors meta.schema_version in the file header, which is readable without parsing
+# any table, so connecting to an up-to-date file costs one pragma.
+_SELECT_USER_VERSION_SQL = "PRAGMA user_version"
+
+_SET_USER_VERSION_SQL = f"PRAGMA user_version = {SCHEMA_VERSION}"
+
+_UPSERT_DESTINATION_SQL = """
+    INSERT INTO destinations(
+        key, group_name, name, location_id, latitude, longitude, created_at, updated_at
+    )
+    VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        group_name=excluded.group_name,
+        name=excluded.name,
+        location_id=excluded.location_id,
+        latitude=excluded.latitude,
+        longitude=excluded.longitude,
+        updated_at=excluded.updated_at
+"""
+
+_SUPERSEDE_RUNNING_RUNS_SQL = """
+    UPDATE search_runs
+    SET status='failed', failure_reason='Superseded by new run', updated_at=?
+    WHERE search_signature=? AND status='running'
+"""
+
+_INSERT_SEARCH_RUN_SQL = """
+    INSERT INTO search_runs(
+        destination_key,
+        destination_group,
+        destination_name,
+        label,
+        check_in,
+        check_out,
+        nights,
+        adults,
+        children,
+        rooms,
+        program_filter,
+        status,
+        started_at,
+        created_at,
+        updated_at,
+        search_signature
+    ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'running', ?, ?, ?, ?)
+"""
+
+_COMPLETE_RUN_SQL = """
+    UPDATE search_runs
+    SET status='complete',
+        completed_at=?,
+        updated_at=?,
+        total_hotels=?,
+        total_rates=?,
+        request_id=?,
+        raw_context=?
+    WHERE id=?
+"""
+
+_SELECT_LATEST_RUN_SQL = """
+    SELECT id, destination_key, destination_name, destination_group, label, status,
+           started_at, updated_at, completed_at, failure_reason, total_hotels,
+           total_rates, search_signature
+    FROM search_runs
+    WHERE search_signature=?
+    ORDER BY started_at DESC
+    LIMIT 1
+"""
+
+_CREATE_SIGNATURE_LOOKUP_SQL = (
+    "CREATE TEMP TABLE IF NOT EXISTS signature_lookup(signature TEXT PRIMARY KEY)"
+)
+
+_INSERT_SIGNATURE_LOOKUP_SQL = "INSERT OR IGNORE INTO temp.signature_lookup(signature) VALUES(?)"
+
+_CLEAR_SIGNATURE_LOOKUP_SQL = "DELETE FROM temp.signature_lookup"
+
+_SELECT_LATEST_RUNS_BY_LOOKUP_SQL = """
+    SELECT id, destination_key, destination_name, destination_group, label, status,
+           started_at, updated_at, completed_at, failure_reason, total_hotels,
+           total_rates, search_signature
+    FROM (
+        SELECT sr.*, ROW_NUMBER() OVER (
+            PARTITION BY sr.search_signature ORDER BY sr.started_at DESC
+        ) AS rn
+        FROM temp.signature_lookup lookup
+        JOIN search_runs sr ON sr.search_signature = lookup.signature
+    )
+    WHERE rn = 1
+"""
+
+_MARK_RUN_FAILED_SQL = """
+    UPDATE search_runs
+    SET status='failed', completed_at=?, updated_at=?, failure_reason=?
+    WHERE id=?
+"""
+
+_UPDATE_RUN_CONTEXT_SQL = (
+    "UPDATE search_runs SET request_id=?, raw_context=?, updated_at=? WHERE id=?"
+)
+
+_UPSERT_HOTEL_SQL = """
+    INSERT INTO hotels(
+        property_id,
+        supplier_id,
+        name,
+        type,
+        brand_name,
+        chain_name,
+        star_rating,
+        phone,
+        address_line1,
+        address_city,
+        address_state,
+        address_postal_code,
+        address_country_code,
+        address_country_name,
+        latitude,
+        longitude,
+        distance_miles,
+        distance_unit,
+        loyalty_valid,
+        user_rating,
+        user_rating_count,
+        hero_image,
+        marketing_insider_tip,
+        marketing_video,
+        location_teaser,
+        renovation_closure_notice,
+        check_in_start,
+        check_in_end,
+        check_out_time,
+        summary_json,
+        search_context_json,
+        raw_json,
+        created_at,
+        updated_at
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+    )
+    ON CONFLICT(property_id) DO UPDATE SET
+        supplier_id=excluded.supplier_id,
+        name=excluded.name,
+        type=excluded.type,
+        brand_name=excluded.brand_name,
+        chain_name=excluded.chain_name,
+        star_rating=excluded.star_rating,
+        phone=excluded.phone,
+        address_line1=excluded.address_line1,
+        address_city=excluded.address_city,
+        address_state=excluded.address_state,
+        address_postal_code=excluded.address_postal_code,
+        address_country_code=excluded.address_country_code,
+        address_country_name=excluded.address_country_name,
+        latitude=excluded.latitude,
+        longitude=excluded.longitude,
+        distance_miles=excluded.distance_miles,
+        distance_unit=excluded.distance_unit,
+        loyalty_valid=excluded.loyalty_valid,
+        user_rating=excluded.user_rating,
+        user_rating_count=excluded.user_rating_count,
+        hero_image=excluded.hero_image,
+        marketing_insider_tip=excluded.marketing_insider_tip,
+        marketing_video=excluded.marketing_video,
+        location_teaser=excluded.location_teaser,
+        renovation_closure_notice=excluded.renovation_closure_notice,
+        check_in_start=excluded.check_in_start,
+        check_in_end=excluded.check_in_end,
+        check_out_time=excluded.check_out_time,
+        summary_json=excluded.summary_json,
+        search_context_json=excluded.search_context_json,
+        raw_json=excluded.raw_json,
+        updated_at=excluded.updated_at
+"""
+
+_SELECT_HOTEL_FEATURES_SQL = (
+    "SELECT property_id, feature_type, value FROM hotel_features "
+    "WHERE property_id IN ({placeholders})"
+)
+
+_DELETE_HOTEL_FEATURE_SQL = (
+    "DELETE FROM hotel_features WHERE property_id=? AND feature_type=? AND value=?"
+)
+
+_INSERT_HOTEL_FEATURE_SQL = (
+    "INSERT OR IGNORE INTO hotel_features(property_id, feature_type, value) VALUES(?, ?, ?)"
+)
+
+_SELECT_PROGRAM_BENEFITS_SQL = """
+    SELECT property_id, program_code, program_name, benefit_type, description, note,
+           start_date, end_date, exceptional_value
+    FROM hotel_program_benefits
+    WHERE property_id IN ({placeholders})
+    ORDER BY id
+"""
+
+_DELETE_PROGRAM_BENEFITS_SQL = "DELETE FROM hotel_program_benefits WHERE property_id=?"
+
+_INSERT_PROGRAM_BENEFIT_SQL = """
+    INSERT INTO hotel_program_benefits(
+        property_id,
+        program_code,
+        program_name,
+        benefit_type,
+        description,
+        note,
+        start_date,
+        end_date,
+        exceptional_value
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_ROOM_TYPE_SQL = """
+    INSERT INTO room_types(
+        property_id,
+        room_type_id,
+        name,
+        amenities_json,
+        bed_groups_json,
+        raw_json,
+        created_at,
+        updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(property_id, room_type_id) DO UPDATE SET
+        name=excluded.name,
+        amenities_json=excluded.amenities_json,
+        bed_groups_json=excluded.bed_groups_json,
+        raw_json=excluded.raw_json,
+        updated_at=excluded.updated_at
+"""
+
+_SELECT_RUN_SNAPSHOT_KEYS_SQL = (
+    "SELECT id, property_id, room_type_id, rate_id FROM rate_snapshots WHERE run_id=?"
+)
+
+_DELETE_RATE_SNAPSHOT_SQL = "DELETE FROM rate_snapshots WHERE id=?"
+
+_DELETE_RUN_NIGHTLY_PRICES_SQL = (
+    "DELETE FROM rate_nightly_prices "
+    "WHERE rate_snapshot_id IN (SELECT id FROM rate_snapshots WHERE run_id=?)"
+)
+
+_DELETE_RUN_RATE_COMPONENTS_SQL = (
+    "DELETE FROM rate_components "
+    "WHERE rate_snapshot_id IN (SELECT id FROM rate_snapshots WHERE run_id=?)"
+)
+
+_MAX_RATE_SNAPSHOT_ID_SQL = "SELECT COALESCE(MAX(id), 0) FROM rate_snapshots"
+
+_LAST_INSERT_ROWID_SQL = "SELECT last_insert_rowid()"
+
+_SELECT_RATE_SNAPSHOT_KEYS_SQL = (
+    "SELECT id, property_id, room_type_id, rate_id FROM rate_snapshots WHERE id > ?"
+)
+
+_UPSERT_RATE_SNAPSHOT_SQL = """
+    INSERT INTO rate_snapshots(
+        run_id,
+        property_id,
+        room_type_id,
+        rate_id,
+        hotel_collection,
+        available,
+        is_breakfast_included,
+        is_food_beverage_credit,
+        is_free_cancellation,
+        is_parking_included,
+        is_shuttle_included,
+        occupancy_adults,
+        occupancy_children,
+        room_count,
+        pricing_currency,
+        pricing_base,
+        pricing_total,
+        pricing_total_inclusive,
+        pricing_total_fees,
+        pricing_total_taxes,
+        average_nightly_rate,
+        average_nightly_rate_points_burn,
+        payment_model,
+        points_burn,
+        points_burn_calculation_json,
+        room_allocations_json,
+        special_offer_json,
+        supplier_rate_promotion_json,
+        comparison_amenity_json,
+        search_context_json,
+        created_at
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+    )
+    ON CONFLICT(run_id, property_id, room_type_id, rate_id) DO UPDATE SET
+        hotel_collection=excluded.hotel_collection,
+        available=excluded.available,
+        is_breakfast_included=excluded.is_breakfast_included,
+        is_food_beverage_credit=excluded.is_food_beverage_credit,
+        is_free_cancellation=excluded.is_free_cancellation,
+        is_parking_included=excluded.is_parking_included,
+        is_shuttle_included=excluded.is_shuttle_included,
+        occupancy_adults=excluded.occupancy_adults,
+        occupancy_children=excluded.occupancy_children,
+        room_count=excluded.room_count,
+        pricing_currency=excluded.pricing_currency,
+        pricing_base=excluded.pricing_base,
+        pricing_total=excluded.pricing_total,
+        pricing_total_inclusive=excluded.pricing_total_inclusive,
+        pricing_total_fees=excluded.pricing_total_fees,
+        pricing_total_taxes=excluded.pricing_total_taxes,
+        average_nightly_rate=excluded.average_nightly_rate,
+        average_nightly_rate_points_burn=excluded.average_nightly_rate_points_burn,
+        payment_model=excluded.payment_model,
+        points_burn=excluded.points_burn,
+        points_burn_calculation_json=excluded.points_burn_calculation_json,
+        room_allocations_json=excluded.room_allocations_json,
+        special_offer_json=excluded.special_offer_json,
+        supplier_rate_promotion_json=excluded.supplier_rate_promotion_json,
+        comparison_amenity_json=excluded.comparison_amenity_json,
+        search_context_json=excluded.search_context_json,
+        created_at=excluded.created_at
+"""
+
+_INSERT_NIGHTLY_PRICE_SQL = """
+    INSERT INTO rate_nightly_prices(
+        rate_snapshot_id,
+        night_index,
+        night_date,
+        actual_rate,
+        inclusive_rate
+    ) VALUES (?, ?, ?, ?, ?)
+"""
+
+_INSERT_RATE_COMPONENT_SQL = """
+    INSERT INTO rate_components(
+        rate_snapshot_id,
+        component_type,
+        code,
+        label,
+        amount,
+        currency,
+        is_included,
+        pay_locally,
+        details_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_PROMOTION_SQL = """
+    INSERT INTO hotel_promotions(
+        property_id,
+        promotion_code,
+        promotion_type,
+        title,
+        description,
+        min_nights,
+        max_nights,
+        booking_start,
+        booking_end,
+        stay_start,
+        stay_end,
+        blackout_dates_json,
+        card_types_json,
+        raw_json,
+        first_seen,
+        last_seen
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(property_id, promotion_code) DO UPDATE SET
+        promotion_type=excluded.promotion_type,
+        title=COALESCE(excluded.title, hotel_promotions.title),
+        description=COALESCE(excluded.description, hotel_promotions.description),
+        min_nights=excluded.min_nights,
+        max_nights=excluded.max_nights,
+        booking_start=excluded.booking_start,
+        booking_end=excluded.booking_end,
+        stay_start=excluded.stay_start,
+        stay_end=excluded.stay_end,
+        blackout_dates_json=excluded.blackout_dates_json,
+        card_types_json=excluded.card_types_json,
+        raw_json=excluded.raw_json,
+        last_seen=excluded.last_seen
+"""
 
 MIGRATIONS: dict[int, str] = {
     1: """
@@ -1280,4 +1811,27 @@ MIGRATIONS: dict[int, str] = {
     5: """
         ALTER TABLE rate_snapshots DROP COLUMN raw_json;
     """,
+    6: """
+        CREATE INDEX IF NOT EXISTS idx_search_runs_sig_started
+            ON search_runs(search_signature, started_at DESC);
+        DROP INDEX IF EXISTS idx_search_runs_signature;
+    """,
+    7: """
+        CREATE INDEX IF NOT EXISTS idx_rate_nightly_prices_snapshot
+            ON rate_nightly_prices(rate_snapshot_id);
+        CREATE INDEX IF NOT EXISTS idx_rate_components_snapshot
+            ON rate_components(rate_snapshot_id);
+    """,
 }
+
+
+def _has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_info({table})"))
+
+
+# Predicates evaluated before a batch of migrations runs; a version whose guard is
+# false is recorded as applied without running its script. Version 1 no longer
+# creates rate_snapshots.raw_json, so only files created before that change need 5.
+MIGRATION_GUARDS: dict[int, Callable[[sqlite3.Connection], bool]] = {
+    5: lambda conn: _has_column(conn, "rate_snapshots", "raw_json"),
+}
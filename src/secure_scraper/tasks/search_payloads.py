@@ -3,16 +3,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import date
+from functools import lru_cache
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class RoomRequest:
     adults: int
     children: List[int] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchParams:
     location_id: str
     location_label: str
@@ -28,26 +29,47 @@ class SearchParams:
     program_filter: Optional[List[str]] = None
 
     def to_payload(self) -> dict:
+        """Build the properties request body.
+
+        Everything except ``pagination`` comes from a shared cache, so callers may only
+        mutate the (fresh) ``pagination`` dict of the result.
+        """
+
         return {
             "pagination": {"page": self.page, "pageSize": self.page_size},
-            "sortOptions": [{"direction": self.sort_direction, "option": self.sort_option}],
-            "checkIn": self.check_in.isoformat(),
-            "checkOut": self.check_out.isoformat(),
-            "location": self.location_id,
-            "locationType": "LOCATION_ID",
-            "rooms": [
-                {"adults": room.adults, "children": room.children}
-                if room.children
-                else {"adults": room.adults}
-                for room in self.rooms
-            ],
-            **(
-                {
-                    "filters": {
-                        "clientProgramFilter": list(self.program_filter),
-                    }
-                }
-                if self.program_filter
-                else {}
+            **_payload_body(
+                self.location_id,
+                self.check_in,
+                self.check_out,
+                tuple((room.adults, tuple(room.children)) for room in self.rooms),
+                self.sort_option,
+                self.sort_direction,
+                tuple(self.program_filter or ()),
             ),
         }
+
+
+@lru_cache(maxsize=256)
+def _payload_body(
+    location_id: str,
+    check_in: date,
+    check_out: date,
+    rooms: tuple[tuple[int, tuple[int, ...]], ...],
+    sort_option: str,
+    sort_direction: str,
+    program_filter: tuple[str, ...],
+) -> dict:
+    body = {
+        "sortOptions": [{"direction": sort_direction, "option": sort_option}],
+        "checkIn": check_in.isoformat(),
+        "checkOut": check_out.isoformat(),
+        "location": location_id,
+        "locationType": "LOCATION_ID",
+        "rooms": [
+            {"adults": adults, "children": list(children)} if children else {"adults": adults}
+            for adults, children in rooms
+        ],
+    }
+    if program_filter:
+        body["filters"] = {"clientProgramFilter": list(program_filter)}
+    return body
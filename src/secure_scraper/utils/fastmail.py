@@ -11,6 +11,11 @@ from typing import Any, Iterable, Optional
 
 import httpx
 
+try:  # pragma: no cover - selectolax is an optional speed-up
+    from selectolax.parser import HTMLParser
+except ImportError:  # pragma: no cover - fall back to regex tag stripping
+    HTMLParser = None  # type: ignore[assignment,misc]
+
 logger = logging.getLogger(__name__)
 
 _JMAP_CORE = "urn:ietf:params:jmap:core"
@@ -33,15 +38,31 @@ _CONTEXT_KEYWORDS: tuple[str, ...] = (
     "enter the code",
     "your code",
 )
+_CONTEXT_KEYWORD_RANK = {keyword: rank for rank, keyword in enumerate(_CONTEXT_KEYWORDS)}
+# A lookahead reports every keyword at its own offset, including ones nested inside a
+# longer keyword ("verification code" within "one-time verification code"). Matching
+# case-insensitively (ASCII only, like the keywords) avoids lower-casing each body.
+_CONTEXT_KEYWORD_RE = re.compile(
+    "(?=("
+    + "|".join(
+        re.escape(keyword) for keyword in sorted(_CONTEXT_KEYWORDS, key=len, reverse=True)
+    )
+    + "))",
+    re.IGNORECASE | re.ASCII,
+)
 _CONTEXT_WINDOW = 80
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_MAX_KEEPALIVE_CONNECTIONS = 4
+# The first poll queries every mailbox at once, so it reads this many times
+# ``message_limit`` to leave room for newer mail in other folders.
+_FIRST_POLL_LIMIT_FACTOR = 5
 
 
 def _snippet(value: str, start: int, end: int, *, radius: int = 40) -> str:
     window_start = max(0, start - radius)
     window_end = min(len(value), end + radius)
-    snippet = value[window_start:window_end]
-    snippet = re.sub(r"\s+", " ", snippet)
-    return snippet.strip()
+    return _WHITESPACE_RE.sub(" ", value[window_start:window_end]).strip()
 
 
 def _parse_received_at(value: Optional[str]) -> Optional[datetime]:
@@ -57,12 +78,28 @@ def _parse_received_at(value: Optional[str]) -> Optional[datetime]:
 
 
 def _strip_html(value: str) -> str:
-    cleaned = re.sub(r"<[^>]+>", " ", value)
-    return html.unescape(cleaned)
+    if HTMLParser is not None:
+        # Lexes the markup once in C; entities are decoded and nodes joined by spaces.
+        return HTMLParser(value).text(separator=" ")
+    return html.unescape(_HTML_TAG_RE.sub(" ", value))
+
+
+class FastmailJmapError(RuntimeError):
+    """Raised when a JMAP method call comes back as an ``error`` response."""
+
+    def __init__(self, message: str, error_type: str) -> None:
+        super().__init__(message)
+        self.error_type = error_type
 
 
 class FastmailOtpFetcher:
-    """Polls Fastmail via JMAP until an OTP code appears."""
+    """Polls Fastmail via JMAP until an OTP code appears.
+
+    The HTTP/2 client is created on first use and kept across :meth:`fetch_code` calls,
+    so later logins reuse the pooled TLS connection. Close it with :meth:`aclose` (or
+    ``async with``); a client passed in by the caller is left open. The JMAP account and
+    mailbox ids are cached the same way until :meth:`reset_session` drops them.
+    """
 
     session_url = "https://api.fastmail.com/jmap/session"
     default_api_url = "https://api.fastmail.com/jmap/"
@@ -80,6 +117,7 @@ class FastmailOtpFetcher:
         recent_window: float = 900.0,
         message_limit: int = 10,
         http_timeout: float = 30.0,
+        client: Optional[httpx.AsyncClient] = None,
     ) -> None:
         if not api_token:
             raise ValueError("Fastmail API token must be provided")
@@ -100,6 +138,41 @@ class FastmailOtpFetcher:
         self.message_limit = message_limit
         self.http_timeout = http_timeout
         self.api_url = self.default_api_url
+        self._client = client
+        self._owns_client = client is None
+        self._account_id: Optional[str] = None
+        self._mailbox_id: Optional[str] = None
+        # ``_mailbox_id`` stays None when the mailbox is missing, so track resolution apart.
+        self._mailbox_resolved = False
+
+    def reset_session(self) -> None:
+        """Forget the cached JMAP endpoint, account and mailbox; the next poll re-resolves them."""
+
+        self.api_url = self.default_api_url
+        self._account_id = None
+        self._mailbox_id = None
+        self._mailbox_resolved = False
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and self._owns_client:
+            await client.aclose()
+
+    async def __aenter__(self) -> "FastmailOtpFetcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, exc_tb) -> None:
+        await self.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.http_timeout,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS),
+            )
+            self._owns_client = True
+        return self._client
 
     async def fetch_code(self) -> str:
         start_time = datetime.now(timezone.utc)
@@ -107,36 +180,50 @@ class FastmailOtpFetcher:
         headers = {"Authorization": f"Bearer {self.api_token}"}
         lookback_cutoff = start_time - timedelta(seconds=self.recent_window)
 
-        async with httpx.AsyncClient(timeout=self.http_timeout) as client:
-            account_id = await self._resolve_account_id(client, headers)
-            mailbox_id = None
-            if self.mailbox:
-                mailbox_id = await self._resolve_mailbox_id(client, headers, account_id, self.mailbox)
-
-            while time.monotonic() < deadline:
-                try:
-                    messages = await self._fetch_recent_messages(client, headers, account_id, mailbox_id)
-                except httpx.HTTPError as exc:
-                    logger.warning("Fastmail query failed: %s", exc)
-                    await asyncio.sleep(self.poll_interval)
-                    continue
-
-                for message in messages:
-                    received_at = _parse_received_at(message.get("receivedAt"))
-                    if received_at and received_at < lookback_cutoff:
-                        continue
-                    if self.subject_pattern and not self.subject_pattern.search(message.get("subject") or ""):
-                        continue
-                    if self.sender_filter_lower and not self._sender_matches(message.get("from")):
-                        continue
-                    code = self._extract_code(message)
-                    if code:
-                        logger.info(
-                            "Fetched OTP code from Fastmail message with subject '%s'",
-                            message.get("subject"),
-                        )
-                        return code
+        client = self._get_client()
+
+        while time.monotonic() < deadline:
+            if self._account_id is None:
+                self._account_id = await self._resolve_account_id(client, headers)
+            account_id = self._account_id
+            try:
+                if self.mailbox and not self._mailbox_resolved:
+                    # Resolved by the first poll itself, batched into the same JMAP request.
+                    self._mailbox_id, messages = await self._fetch_first_messages(
+                        client, headers, account_id
+                    )
+                    self._mailbox_resolved = True
+                else:
+                    messages = await self._fetch_recent_messages(
+                        client, headers, account_id, self._mailbox_id
+                    )
+            except FastmailJmapError as exc:
+                if exc.error_type == "accountNotFound":
+                    self.reset_session()
+                raise
+            except httpx.HTTPError as exc:
+                logger.warning("Fastmail query failed: %s", exc)
+                if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 401:
+                    self.reset_session()
                 await asyncio.sleep(self.poll_interval)
+                continue
+
+            for message in messages:
+                received_at = _parse_received_at(message.get("receivedAt"))
+                if received_at and received_at < lookback_cutoff:
+                    continue
+                if self.subject_pattern and not self.subject_pattern.search(message.get("subject") or ""):
+                    continue
+                if self.sender_filter_lower and not self._sender_matches(message.get("from")):
+                    continue
+                code = self._extract_code(message)
+                if code:
+                    logger.info(
+                        "Fetched OTP code from Fastmail message with subject '%s'",
+                        message.get("subject"),
+                    )
+                    return code
+            await asyncio.sleep(self.poll_interval)
 
         raise RuntimeError("Timed out waiting for OTP email via Fastmail")
 
@@ -152,22 +239,43 @@ class FastmailOtpFetcher:
         except KeyError as exc:  # pragma: no cover - defensive
             raise RuntimeError("Fastmail session response missing mail account information") from exc
 
-    async def _resolve_mailbox_id(
+    async def _fetch_first_messages(
         self,
         client: httpx.AsyncClient,
         headers: dict[str, str],
         account_id: str,
-        mailbox: str,
-    ) -> Optional[str]:
+    ) -> tuple[Optional[str], list[dict[str, Any]]]:
+        """Resolve the mailbox and run the first message query in one JMAP request.
+
+        The query cannot reference a mailbox picked by role-or-name matching, so this one
+        poll spans all mailboxes and is narrowed client-side via ``mailboxIds``. Newer
+        mail in other folders shares the query limit, so it is raised for this poll and
+        the matches are cut back to ``message_limit`` afterwards.
+        """
+
         method_calls = [
             [
                 "Mailbox/get",
                 {"accountId": account_id, "properties": ["id", "name", "role"]},
                 "m1",
-            ]
+            ],
+            *self._message_calls(
+                account_id, None, limit=self.message_limit * _FIRST_POLL_LIMIT_FACTOR
+            ),
         ]
         payload = await self._post(client, headers, method_calls)
         mailboxes = self._extract_method(payload, "Mailbox/get", call_id="m1").get("list", [])
+        mailbox_id = self._select_mailbox_id(mailboxes, self.mailbox or "")
+        messages = self._extract_method(payload, "Email/get", call_id="g1").get("list", [])
+        if mailbox_id:
+            messages = [
+                message
+                for message in messages
+                if (message.get("mailboxIds") or {}).get(mailbox_id)
+            ]
+        return mailbox_id, messages[: self.message_limit]
+
+    def _select_mailbox_id(self, mailboxes: list[dict[str, Any]], mailbox: str) -> Optional[str]:
         target = mailbox.lower()
 
         for entry in mailboxes:
@@ -190,6 +298,13 @@ class FastmailOtpFetcher:
         account_id: str,
         mailbox_id: Optional[str],
     ) -> list[dict[str, Any]]:
+        payload = await self._post(client, headers, self._message_calls(account_id, mailbox_id))
+        email_get = self._extract_method(payload, "Email/get", call_id="g1")
+        return email_get.get("list", [])
+
+    def _message_calls(
+        self, account_id: str, mailbox_id: Optional[str], *, limit: Optional[int] = None
+    ) -> list[list[Any]]:
         filter_args: dict[str, Any] = {}
         if mailbox_id:
             filter_args["inMailbox"] = mailbox_id
@@ -199,12 +314,12 @@ class FastmailOtpFetcher:
         query_args: dict[str, Any] = {
             "accountId": account_id,
             "sort": [{"property": "receivedAt", "isAscending": False}],
-            "limit": self.message_limit,
+            "limit": limit or self.message_limit,
         }
         if filter_args:
             query_args["filter"] = filter_args
 
-        method_calls = [
+        return [
             [
                 "Email/query",
                 query_args,
@@ -215,7 +330,16 @@ class FastmailOtpFetcher:
                 {
                     "accountId": account_id,
                     "#ids": {"resultOf": "q1", "name": "Email/query", "path": "/ids"},
-                    "properties": ["id", "subject", "receivedAt", "from", "textBody", "htmlBody", "bodyValues"],
+                    "properties": [
+                        "id",
+                        "mailboxIds",
+                        "subject",
+                        "receivedAt",
+                        "from",
+                        "textBody",
+                        "htmlBody",
+                        "bodyValues",
+                    ],
                     "fetchTextBodyValues": True,
                     "fetchHTMLBodyValues": True,
                     "bodyProperties": ["partId", "type"],
@@ -224,10 +348,6 @@ class FastmailOtpFetcher:
             ],
         ]
 
-        payload = await self._post(client, headers, method_calls)
-        email_get = self._extract_method(payload, "Email/get", call_id="g1")
-        return email_get.get("list", [])
-
     async def _post(
         self,
         client: httpx.AsyncClient,
@@ -261,7 +381,7 @@ class FastmailOtpFetcher:
                     message = f"Fastmail JMAP call {name} ({call_id}) returned error {error_type}"
                     if description:
                         message = f"{message}: {description}"
-                    raise RuntimeError(message)
+                    raise FastmailJmapError(message, error_type)
         available = [method_name for method_name, _arguments, _call_id in method_responses]
         raise RuntimeError(
             f"Fastmail JMAP response missing {name}; methods present: {available}"
@@ -295,6 +415,8 @@ class FastmailOtpFetcher:
         span: tuple[int, int],
         keyword: Optional[str] = None,
     ) -> None:
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         start, end = span
         try:
             snippet = _snippet(text, start, end)
@@ -314,59 +436,61 @@ class FastmailOtpFetcher:
         if not text:
             return None
 
-        lowered = text.lower()
-        for keyword in _CONTEXT_KEYWORDS:
-            start = 0
-            while True:
-                idx = lowered.find(keyword, start)
-                if idx == -1:
-                    break
-                after_start = idx + len(keyword)
-                after_end = min(len(text), after_start + _CONTEXT_WINDOW)
-                after_window = text[after_start:after_end]
-                for match in self.code_pattern.finditer(after_window):
-                    absolute_start = after_start + match.start(1)
-                    absolute_end = after_start + match.end(1)
-                    if not self._match_is_valid(text, absolute_start, absolute_end):
-                        continue
-                    self._log_candidate(
-                        source="context-after",
-                        text=text,
-                        span=(absolute_start, absolute_end),
-                        keyword=keyword,
-                    )
-                    return match.group(1)
-
-                before_start = max(0, idx - _CONTEXT_WINDOW)
-                before_end = idx
-                before_window = text[before_start:before_end]
-                before_candidates: list[tuple[re.Match[str], int, int]] = []
-                for match in self.code_pattern.finditer(before_window):
-                    absolute_start = before_start + match.start(1)
-                    absolute_end = before_start + match.end(1)
-                    if not self._match_is_valid(text, absolute_start, absolute_end):
-                        continue
-                    before_candidates.append((match, absolute_start, absolute_end))
-
-                if before_candidates:
-                    selected, abs_start, abs_end = before_candidates[-1]
-                    self._log_candidate(
-                        source="context-before",
-                        text=text,
-                        span=(abs_start, abs_end),
-                        keyword=keyword,
-                    )
-                    return selected.group(1)
-                start = idx + len(keyword)
+        # One pass finds every keyword occurrence; visiting them by keyword rank, then
+        # position, keeps the old keyword-by-keyword priority.
+        # Each hit carries the keyword's end offset, so no len() is needed per occurrence.
+        hits = sorted(
+            (_CONTEXT_KEYWORD_RANK[match.group(1).lower()], match.start(), match.end(1))
+            for match in _CONTEXT_KEYWORD_RE.finditer(text)
+        )
+        text_len = len(text)
+        for rank, idx, after_start in hits:
+            keyword = _CONTEXT_KEYWORDS[rank]
+            after_end = min(text_len, after_start + _CONTEXT_WINDOW)
+            after_window = text[after_start:after_end]
+            for match in self.code_pattern.finditer(after_window):
+                absolute_start = after_start + match.start(1)
+                absolute_end = after_start + match.end(1)
+                if not self._match_is_valid(text, absolute_start, absolute_end):
+                    continue
+                self._log_candidate(
+                    source="context-after",
+                    text=text,
+                    span=(absolute_start, absolute_end),
+                    keyword=keyword,
+                )
+                return match.group(1)
+
+            before_start = max(0, idx - _CONTEXT_WINDOW)
+            before_end = idx
+            before_window = text[before_start:before_end]
+            # Only the valid match closest to the keyword matters; remember just that one.
+            selected: Optional[re.Match[str]] = None
+            for match in self.code_pattern.finditer(before_window):
+                if self._match_is_valid(
+                    text, before_start + match.start(1), before_start + match.end(1)
+                ):
+                    selected = match
+
+            if selected is not None:
+                self._log_candidate(
+                    source="context-before",
+                    text=text,
+                    span=(before_start + selected.start(1), before_start + selected.end(1)),
+                    keyword=keyword,
+                )
+                return selected.group(1)
         return None
 
     def _extract_code(self, message: dict[str, Any]) -> Optional[str]:
+        # Every text is first searched with code_pattern as a whole: without a candidate
+        # anywhere there is nothing for the keyword-context scan to find either.
         subject = message.get("subject") or ""
-        contextual = self._find_contextual_code(subject)
-        if contextual:
-            return contextual
         match = self.code_pattern.search(subject)
         if match:
+            contextual = self._find_contextual_code(subject)
+            if contextual:
+                return contextual
             span = match.span(1)
             if self._match_is_valid(subject, *span):
                 self._log_candidate(source="subject", text=subject, span=span)
@@ -379,11 +503,11 @@ class FastmailOtpFetcher:
             if not part_id or part_id not in body_values:
                 continue
             value = body_values[part_id].get("value") or ""
-            contextual = self._find_contextual_code(value)
-            if contextual:
-                return contextual
             match = self.code_pattern.search(value)
             if match:
+                contextual = self._find_contextual_code(value)
+                if contextual:
+                    return contextual
                 span = match.span(1)
                 if not self._match_is_valid(value, *span):
                     continue
@@ -395,12 +519,15 @@ class FastmailOtpFetcher:
             if not part_id or part_id not in body_values:
                 continue
             value = body_values[part_id].get("value") or ""
+            # A real code is already visible in the raw markup, so skip stripping parts without one.
+            if not self.code_pattern.search(value):
+                continue
             stripped = _strip_html(value)
-            contextual = self._find_contextual_code(stripped)
-            if contextual:
-                return contextual
             match = self.code_pattern.search(stripped)
             if match:
+                contextual = self._find_contextual_code(stripped)
+                if contextual:
+                    return contextual
                 span = match.span(1)
                 if not self._match_is_valid(stripped, *span):
                     continue
@@ -55,3 +55,10 @@ class OtpResolver:
         if not self.prompt:
             raise RuntimeError("OTP secret not provided and prompting disabled")
         return await asyncio.to_thread(input, "Enter verification code: ")
+
+    async def aclose(self) -> None:
+        """Release the email fetcher's resources (e.g. its HTTP client) if it holds any."""
+
+        close = getattr(self.email_fetcher, "aclose", None)
+        if close is not None:
+            await close()
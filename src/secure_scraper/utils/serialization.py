@@ -0,0 +1,164 @@
+"""JSON helpers that prefer orjson when it is installed."""
+from __future__ import annotations
+
+import io
+import json
+from collections.abc import Iterator
+from itertools import islice
+from typing import Any
+
+try:  # pragma: no cover - orjson is an optional speed-up
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - ijson is an optional streaming parser
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:  # pragma: no cover - fall back to a full parse
+    ijson = None  # type: ignore[assignment]
+    ObjectBuilder = None  # type: ignore[assignment,misc]
+else:  # pragma: no cover - depends on how ijson was built
+    try:
+        ijson = ijson.get_backend("yajl2_c")
+    except ImportError:
+        pass
+
+
+# json.dumps builds a fresh encoder whenever it gets non-default options, so the
+# stdlib fallback keeps one compact, non-ASCII-escaping encoder around instead.
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """Serialise ``value`` to compact UTF-8 JSON bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return _COMPACT_ENCODER.encode(value).encode()
+
+
+def dumps_pretty(value: Any) -> bytes:
+    """Serialise ``value`` to two-space indented UTF-8 JSON bytes for files meant to be read."""
+
+    if orjson is not None:
+        return orjson.dumps(
+            value, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(value, indent=2, ensure_ascii=False, default=str).encode()
+
+
+def dumps(value: Any) -> str:
+    """Serialise ``value`` to a compact JSON string."""
+
+    return dumps_bytes(value).decode()
+
+
+def iter_items(data: bytes, prefix: str) -> Iterator[Any]:
+    """Lazily yield the values under an ijson-style ``prefix`` (e.g. ``"hotels.item"``).
+
+    With ijson installed, the document is parsed incrementally and objects are built only
+    for matching values. Without it, the whole document is parsed and then walked.
+    """
+
+    if ijson is not None:
+        # use_float keeps non-integers as float, matching the json/orjson fallback below;
+        # ijson would otherwise hand back decimal.Decimal.
+        return ijson.items(io.BytesIO(data), prefix, use_float=True)
+    return _walk_prefix(loads(data), _split_prefix(prefix))
+
+
+class JsonItems:
+    """One JSON document read by ijson-style prefix.
+
+    With ijson installed, the raw bytes are kept and every read is an incremental pass.
+    Without it, the document is parsed once here and each read walks the parsed value.
+    """
+
+    __slots__ = ("_data", "_document")
+
+    def __init__(self, data: bytes) -> None:
+        if ijson is None:
+            self._data: bytes | None = None
+            self._document: Any = loads(data)
+        else:
+            self._data = data
+            self._document = None
+
+    def first(self, *prefixes: str) -> dict[str, Any]:
+        """Return the first value under each prefix, reading the document once.
+
+        Prefixes without a value are left out. The incremental parse stops as soon as
+        every prefix has matched.
+        """
+
+        if self._data is None:
+            return {
+                prefix: value
+                for prefix in prefixes
+                for value in islice(_walk_prefix(self._document, _split_prefix(prefix)), 1)
+            }
+        return _first_values(self._data, prefixes)
+
+    def items(self, prefix: str) -> Iterator[Any]:
+        """Lazily yield every value under ``prefix``."""
+
+        if self._data is None:
+            return _walk_prefix(self._document, _split_prefix(prefix))
+        return iter_items(self._data, prefix)
+
+
+def _first_values(data: bytes, prefixes: tuple[str, ...]) -> dict[str, Any]:
+    pending = set(prefixes)
+    found: dict[str, Any] = {}
+    events = ijson.parse(io.BytesIO(data), use_float=True)
+    for prefix, event, value in events:
+        if prefix not in pending or event in ("map_key", "end_map", "end_array"):
+            continue
+        if event in ("start_map", "start_array"):
+            # Build just this container, as ijson.items() does, then keep scanning.
+            builder = ObjectBuilder()
+            end_event = event.replace("start", "end")
+            current = prefix
+            while (current, event) != (prefix, end_event):
+                builder.event(event, value)
+                current, event, value = next(events)
+            value = builder.value
+            # Prefixes nested inside this container were consumed with it.
+            for nested in [p for p in pending if p.startswith(f"{prefix}.")]:
+                parts = _split_prefix(nested[len(prefix) + 1 :])
+                for nested_value in islice(_walk_prefix(value, parts), 1):
+                    found[nested] = nested_value
+                    pending.discard(nested)
+        found[prefix] = value
+        pending.discard(prefix)
+        if not pending:
+            break
+    return found
+
+
+def _split_prefix(prefix: str) -> list[str]:
+    return prefix.split(".") if prefix else []
+
+
+def _walk_prefix(value: Any, parts: list[str]) -> Iterator[Any]:
+    if not parts:
+        yield value
+        return
+    head, rest = parts[0], parts[1:]
+    if head == "item":
+        if isinstance(value, list):
+            for entry in value:
+                yield from _walk_prefix(entry, rest)
+    elif isinstance(value, dict) and head in value:
+        yield from _walk_prefix(value[head], rest)
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Parse JSON from text or raw bytes."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
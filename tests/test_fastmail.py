@@ -30,6 +30,8 @@ class _DummyAsyncClient:
         self.post_urls: list[str] = []
         self._session_payload: dict[str, Any] = {}
         self.request_bodies: list[dict[str, Any]] = []
+        self.closed = False
+        self.get_urls: list[str] = []
 
     def configure(
         self,
@@ -46,7 +48,11 @@ class _DummyAsyncClient:
     async def __aexit__(self, exc_type, exc, tb) -> None:
         return None
 
+    async def aclose(self) -> None:
+        self.closed = True
+
     async def get(self, url: str, headers: dict[str, str] | None = None) -> _DummyResponse:
+        self.get_urls.append(url)
         return _DummyResponse(self._session_payload)
 
     async def post(
@@ -70,24 +76,31 @@ async def test_fastmail_fetcher_uses_session_api_url(monkeypatch: pytest.MonkeyP
         "primaryAccounts": {"urn:ietf:params:jmap:mail": "account-1"},
         "apiUrl": "https://alt.fastmail.test/jmap/api",
     }
-    mailbox_payload = {
+    first_payload = {
         "methodResponses": [
-            ["Mailbox/get", {"list": [{"id": "mailbox-1", "role": "inbox", "name": "Inbox"}]}, "m1"]
-        ]
-    }
-    message_payload = {
-        "methodResponses": [
-            ["Email/query", {"ids": ["message-1"]}, "q1"],
+            [
+                "Mailbox/get",
+                {"list": [{"id": "mailbox-1", "role": "inbox", "name": "Inbox"}]},
+                "m1",
+            ],
+            ["Email/query", {"ids": ["message-0", "message-1"]}, "q1"],
             [
                 "Email/get",
                 {
                     "list": [
+                        {
+                            "id": "message-0",
+                            "mailboxIds": {"mailbox-sent": True},
+                            "subject": "Your code is 135790",
+                            "receivedAt": datetime.now(timezone.utc).isoformat(),
+                        },
                         {
                             "id": "message-1",
+                            "mailboxIds": {"mailbox-1": True},
                             "subject": "Your code is 246810",
                             "receivedAt": datetime.now(timezone.utc).isoformat(),
                             "bodyValues": {},
-                        }
+                        },
                     ]
                 },
                 "g1",
@@ -99,7 +112,7 @@ async def test_fastmail_fetcher_uses_session_api_url(monkeypatch: pytest.MonkeyP
 
     def _make_dummy_async_client(*args: Any, **kwargs: Any) -> _DummyAsyncClient:
         client = _DummyAsyncClient()
-        client.configure(session_payload=session_payload, post_payloads=[mailbox_payload, message_payload])
+        client.configure(session_payload=session_payload, post_payloads=[first_payload])
         dummy_instances.append(client)
         return client
 
@@ -110,11 +123,13 @@ async def test_fastmail_fetcher_uses_session_api_url(monkeypatch: pytest.MonkeyP
     assert code == "246810"
     assert fetcher.api_url == "https://alt.fastmail.test/jmap/api/"
     assert dummy_instances, "expected FastmailOtpFetcher to create an AsyncClient"
-    assert dummy_instances[0].post_urls == [
-        "https://alt.fastmail.test/jmap/api/",
-        "https://alt.fastmail.test/jmap/api/",
-    ]
-    assert dummy_instances[0].request_bodies[1]["methodCalls"][1][1]["#ids"]["path"] == "/ids"
+    # Mailbox resolution rides along with the first Email/query + Email/get round-trip.
+    assert dummy_instances[0].post_urls == ["https://alt.fastmail.test/jmap/api/"]
+    method_calls = dummy_instances[0].request_bodies[0]["methodCalls"]
+    assert [call[0] for call in method_calls] == ["Mailbox/get", "Email/query", "Email/get"]
+    assert method_calls[2][1]["#ids"]["path"] == "/ids"
+    # The all-mailbox poll reads further back so other folders cannot crowd out the OTP.
+    assert method_calls[1][1]["limit"] > fetcher.message_limit
 
 
 @pytest.mark.asyncio
@@ -125,13 +140,9 @@ async def test_fastmail_fetcher_surfaces_jmap_errors(monkeypatch: pytest.MonkeyP
         "primaryAccounts": {"urn:ietf:params:jmap:mail": "account-1"},
         "apiUrl": "https://alt.fastmail.test/jmap/api",
     }
-    mailbox_payload = {
-        "methodResponses": [
-            ["Mailbox/get", {"list": [{"id": "mailbox-1", "role": "inbox"}]}, "m1"]
-        ]
-    }
     error_payload = {
         "methodResponses": [
+            ["Mailbox/get", {"list": [{"id": "mailbox-1", "role": "inbox"}]}, "m1"],
             ["Email/query", {"ids": []}, "q1"],
             ["error", {"type": "accountNotFound", "description": "unknown account"}, "g1"],
         ]
@@ -139,10 +150,90 @@ async def test_fastmail_fetcher_surfaces_jmap_errors(monkeypatch: pytest.MonkeyP
 
     def _make_dummy_async_client(*args: Any, **kwargs: Any) -> _DummyAsyncClient:
         client = _DummyAsyncClient()
-        client.configure(session_payload=session_payload, post_payloads=[mailbox_payload, error_payload])
+        client.configure(session_payload=session_payload, post_payloads=[error_payload])
         return client
 
     monkeypatch.setattr("secure_scraper.utils.fastmail.httpx.AsyncClient", _make_dummy_async_client)
 
     with pytest.raises(RuntimeError, match="returned error accountNotFound"):
         await fetcher.fetch_code()
+    # An unknown account invalidates the cached session so the next fetch starts over.
+    assert fetcher._account_id is None
+    assert fetcher.api_url == FastmailOtpFetcher.default_api_url
+
+
+@pytest.mark.asyncio
+async def test_fastmail_fetcher_reuses_client_across_fetches(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fetcher = FastmailOtpFetcher(api_token="token")
+
+    session_payload = {"primaryAccounts": {"urn:ietf:params:jmap:mail": "account-1"}}
+
+    def _message_payload(code: str, *, with_mailboxes: bool = False) -> dict[str, Any]:
+        mailboxes = [["Mailbox/get", {"list": [{"id": "mailbox-1", "role": "inbox"}]}, "m1"]]
+        return {
+            "methodResponses": [
+                *(mailboxes if with_mailboxes else []),
+                ["Email/query", {"ids": ["message-1"]}, "q1"],
+                [
+                    "Email/get",
+                    {
+                        "list": [
+                            {
+                                "id": "message-1",
+                                "mailboxIds": {"mailbox-1": True},
+                                "subject": f"Your code is {code}",
+                                "receivedAt": datetime.now(timezone.utc).isoformat(),
+                            }
+                        ]
+                    },
+                    "g1",
+                ],
+            ]
+        }
+
+    dummy_instances: list[_DummyAsyncClient] = []
+
+    def _make_dummy_async_client(*args: Any, **kwargs: Any) -> _DummyAsyncClient:
+        client = _DummyAsyncClient()
+        client.configure(
+            session_payload=session_payload,
+            post_payloads=[
+                _message_payload("111111", with_mailboxes=True),
+                _message_payload("222222"),
+            ],
+        )
+        dummy_instances.append(client)
+        return client
+
+    monkeypatch.setattr("secure_scraper.utils.fastmail.httpx.AsyncClient", _make_dummy_async_client)
+
+    async with fetcher:
+        assert await fetcher.fetch_code() == "111111"
+        assert await fetcher.fetch_code() == "222222"
+
+    client = dummy_instances[0]
+    assert len(dummy_instances) == 1
+    assert client.closed
+    # The session and mailbox are resolved once and reused by the second fetch.
+    assert len(client.get_urls) == 1
+    second_calls = client.request_bodies[1]["methodCalls"]
+    assert [call[0] for call in second_calls] == ["Email/query", "Email/get"]
+    assert second_calls[0][1]["filter"]["inMailbox"] == "mailbox-1"
+    assert second_calls[0][1]["limit"] == fetcher.message_limit
+
+
+def test_fastmail_extract_code_skips_parts_without_candidates() -> None:
+    fetcher = FastmailOtpFetcher(api_token="token")
+    message = {
+        "subject": "Sign-in request",
+        "htmlBody": [{"partId": "1"}, {"partId": "2"}],
+        "bodyValues": {
+            "1": {"value": "<p>Hello <b>there</b></p>"},
+            "2": {"value": "<p>Ref 12345678</p><p>Your verification code: <b>482913</b></p>"},
+        },
+    }
+
+    assert fetcher._extract_code(message) == "482913"
+    assert fetcher._extract_code({"subject": "No digits here", "textBody": []}) is None
@@ -48,6 +48,24 @@ async def test_obtain_code_raises_when_fetcher_fails_without_prompt():
         await resolver.obtain_code()
 
 
+@pytest.mark.asyncio
+async def test_aclose_closes_fetcher_client():
+    class ClosingFetcher:
+        closed = False
+
+        async def fetch_code(self) -> str:
+            return "123456"
+
+        async def aclose(self) -> None:
+            self.closed = True
+
+    fetcher = ClosingFetcher()
+    await OtpResolver(secret=None, email_fetcher=fetcher, prompt=False).aclose()
+    assert fetcher.closed
+    # Fetchers without a close hook (and no fetcher at all) are left alone.
+    await OtpResolver(secret=None, email_fetcher=None, prompt=False).aclose()
+
+
 def test_fastmail_fetcher_extracts_code_from_subject():
     fetcher = FastmailOtpFetcher(api_token="token")
     message = {"subject": "Your code is 654321", "bodyValues": {}}
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import stat
+from types import SimpleNamespace
+
+import pytest
+
+from secure_scraper.services.search_client import BackendUnavailableError, SearchClient
+
+
+def test_token_cache_is_written_owner_only(tmp_path) -> None:
+    cache_path = tmp_path / "storage" / "account_token.json"
+    client = SearchClient(None, token_cache_path=cache_path)  # type: ignore[arg-type]
+
+    client._write_cached_token("secret-token", "fingerprint")
+
+    assert stat.S_IMODE(cache_path.stat().st_mode) == 0o600
+    assert [path.name for path in cache_path.parent.iterdir()] == ["account_token.json"]
+    cached = client._read_cached_token("fingerprint")
+    assert cached is not None and cached[0] == "secret-token"
+    assert client._read_cached_token("other-session") is None
+
+
+@pytest.mark.asyncio
+async def test_forced_refresh_queues_behind_plain_token_load() -> None:
+    client = SearchClient(None)  # type: ignore[arg-type]
+    loads: list[bool] = []
+    release = asyncio.Event()
+
+    async def fake_load(*, force_refresh):
+        loads.append(force_refresh)
+        await release.wait()
+        return f"token-{len(loads)}"
+
+    client._load_account_token = fake_load  # type: ignore[method-assign]
+    plain = asyncio.ensure_future(client._ensure_account_token())
+    await asyncio.sleep(0)
+    forced = [
+        asyncio.ensure_future(client._ensure_account_token(force_refresh=True)) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await plain == "token-1"
+    assert [await future for future in forced] == ["token-2", "token-2"]
+    assert loads == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_session_refreshes_share_one_navigation() -> None:
+    client = SearchClient(None)  # type: ignore[arg-type]
+    navigations: list[int] = []
+
+    async def fake_navigate():
+        navigations.append(1)
+        await asyncio.sleep(0.01)
+
+    client._navigate_travel_session = fake_navigate  # type: ignore[method-assign]
+
+    await asyncio.gather(*(client._refresh_travel_session() for _ in range(4)))
+    await client._refresh_travel_session()
+
+    assert len(navigations) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_page_cancels_sibling_fetches() -> None:
+    client = SearchClient(None)  # type: ignore[arg-type]
+    cancelled: list[int] = []
+
+    async def fake_next_page(payload, *, account_token, headers):
+        page = payload["pagination"]["page"]
+        if page == 2:
+            raise BackendUnavailableError(503, "unavailable")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(page)
+            raise
+        return b"{}", account_token
+
+    client._fetch_next_page = fake_next_page  # type: ignore[method-assign]
+    payload = {"pagination": {"page": 1, "size": 10}}
+
+    with pytest.raises(BackendUnavailableError):
+        await client._fetch_pages_concurrently(
+            SimpleNamespace(location_id="ZMETRO-TEST"),  # type: ignore[arg-type]
+            payload,
+            range(2, 5),
+            account_token="token",
+            headers={},
+        )
+
+    assert sorted(cancelled) == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_prompt_warmup_skips_direct_post() -> None:
+    client = SearchClient(None)  # type: ignore[arg-type]
+    posts: list[dict] = []
+
+    async def fake_capture(page):
+        return b'{"warmup": true}'
+
+    async def fake_post(payload, headers):
+        posts.append(payload)
+        return b'{"direct": true}'
+
+    client._capture_warmup_response = fake_capture  # type: ignore[method-assign]
+    client._post_properties = fake_post  # type: ignore[method-assign]
+
+    assert await client._race_warmup_and_post(None, {}, {}) == b'{"warmup": true}'  # type: ignore[arg-type]
+    assert posts == []
+
+
+@pytest.mark.asyncio
+async def test_slow_warmup_races_direct_post(monkeypatch) -> None:
+    monkeypatch.setattr("secure_scraper.services.search_client.WARMUP_HEAD_START_S", 0.01)
+    client = SearchClient(None)  # type: ignore[arg-type]
+
+    async def slow_capture(page):
+        await asyncio.sleep(10)
+        return b'{"warmup": true}'
+
+    async def fake_post(payload, headers):
+        return b'{"direct": true}'
+
+    client._capture_warmup_response = slow_capture  # type: ignore[method-assign]
+    client._post_properties = fake_post  # type: ignore[method-assign]
+
+    assert await client._race_warmup_and_post(None, {}, {}) == b'{"direct": true}'  # type: ignore[arg-type]
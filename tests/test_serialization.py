@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+
+from secure_scraper.utils import serialization
+from secure_scraper.utils.serialization import JsonItems, iter_items
+
+_PAGE = b'{"hotels":[{"id":"h1","rate":412.5},{"id":"h2","rate":99}],"context":{"page":1}}'
+
+
+def test_iter_items_walks_parsed_document_without_ijson(monkeypatch) -> None:
+    monkeypatch.setattr(serialization, "ijson", None)
+
+    hotels = list(iter_items(_PAGE, "hotels.item"))
+
+    assert [hotel["id"] for hotel in hotels] == ["h1", "h2"]
+    assert type(hotels[0]["rate"]) is float
+    assert list(iter_items(_PAGE, "context")) == [{"page": 1}]
+    assert list(iter_items(_PAGE, "missing.item")) == []
+
+
+def test_iter_items_with_ijson_yields_floats() -> None:
+    if serialization.ijson is None:
+        pytest.skip("ijson is not installed")
+
+    rates = [hotel["rate"] for hotel in iter_items(_PAGE, "hotels.item")]
+
+    assert rates == [412.5, 99]
+    assert type(rates[0]) is float
+
+
+@pytest.mark.parametrize("with_ijson", [False, True])
+def test_json_items_first_reads_each_prefix_once(monkeypatch, with_ijson: bool) -> None:
+    if with_ijson and serialization.ijson is None:
+        pytest.skip("ijson is not installed")
+    if not with_ijson:
+        monkeypatch.setattr(serialization, "ijson", None)
+
+    page = JsonItems(_PAGE)
+    first = page.first("hotels.item", "context", "context.page", "missing.item")
+
+    assert first == {
+        "hotels.item": {"id": "h1", "rate": 412.5},
+        "context": {"page": 1},
+        "context.page": 1,
+    }
+    assert type(first["hotels.item"]["rate"]) is float
+    assert [hotel["id"] for hotel in page.items("hotels.item")] == ["h1", "h2"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import sqlite3
 from datetime import date
 
@@ -224,6 +225,22 @@ async def test_sqlite_store_custom_pragmas(tmp_path) -> None:
         conn.close()
 
 
+@pytest.mark.asyncio
+async def test_sqlite_store_cache_pragmas(tmp_path) -> None:
+    store = SqliteStore(tmp_path / "cache.sqlite", cache_size_kib=2048, mmap_bytes=0)
+    await store.initialize()
+
+    conn = store._require_connection()
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2048
+    assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 0
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+
+    await store.close()
+
+    with pytest.raises(ValueError):
+        SqliteStore(tmp_path / "bad.sqlite", mmap_bytes=-1)
+
+
 @pytest.mark.asyncio
 async def test_fetch_latest_runs_bulk(tmp_path) -> None:
     db_path = tmp_path / "bulk.sqlite"
@@ -305,4 +322,225 @@ async def test_fetch_latest_runs_bulk(tmp_path) -> None:
     assert results["dest-a"].status == "complete"
     assert results["dest-b"].status == "failed"
 
+    rerun_a = await store.begin_run(destination=dest_a, params=params_a, label="bulk")
+    results = await store.fetch_latest_runs_bulk(runs, label="bulk")
+    assert results["dest-a"].id == rerun_a
+    assert results["dest-a"].status == "running"
+
+    run_c = await store.begin_run(destination=dest_c, params=params_c, label="bulk")
+    await store.mark_runs_failed([rerun_a, run_c], "group failed")
+    results = await store.fetch_latest_runs_bulk(runs, label="bulk")
+    assert {results[key].status for key in ("dest-a", "dest-c")} == {"failed"}
+    assert results["dest-c"].failure_reason == "group failed"
+
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_save_hotels_resyncs_features_and_benefits(tmp_path) -> None:
+    db_path = tmp_path / "features.sqlite"
+    store = SqliteStore(db_path)
+    await store.initialize()
+
+    def _hotel(amenities: list[str], benefits: list[dict[str, str]]) -> dict:
+        return {
+            "property_id": "hotel-1",
+            "summary": {"name": "Hotel", "amenities": amenities, "program_benefits": benefits},
+        }
+
+    breakfast = {"program_code": "FHR", "benefit_type": "BREAKFAST"}
+    credit = {"program_code": "FHR", "benefit_type": "CREDIT"}
+    benefit_ids = "SELECT id FROM hotel_program_benefits"
+    await store.save_hotels(1, [_hotel(["Pool", "Spa"], [breakfast])])
+    first_benefit_id = store._require_connection().execute(benefit_ids).fetchone()[0]
+    await store.save_hotels(1, [_hotel(["Spa", "Gym"], [breakfast])])
+    # Unchanged benefits are left in place rather than deleted and re-inserted.
+    assert store._require_connection().execute(benefit_ids).fetchone()[0] == first_benefit_id
+    await store.save_hotels(1, [_hotel(["Spa", "Gym"], [breakfast, credit])])
+    await store.close()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        amenities = conn.execute(
+            "SELECT value FROM hotel_features WHERE feature_type='amenity' ORDER BY value"
+        ).fetchall()
+        assert amenities == [("Gym",), ("Spa",)]
+        benefits = conn.execute(
+            "SELECT id, benefit_type FROM hotel_program_benefits ORDER BY id"
+        ).fetchall()
+        assert [row[1] for row in benefits] == ["BREAKFAST", "CREDIT"]
+        assert benefits[0][0] != first_benefit_id
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_save_hotels_commits_in_batches(tmp_path) -> None:
+    store = SqliteStore(tmp_path / "batches.sqlite", write_batch_size=2)
+    await store.initialize()
+
+    records = (
+        {"property_id": f"hotel-{idx}", "summary": {"amenities": ["Spa"]}} for idx in range(5)
+    )
+    await store.save_hotels(1, records)
+
+    conn = store._require_connection()
+    assert conn.execute("SELECT COUNT(*) FROM hotels").fetchone()[0] == 5
+    assert conn.execute("SELECT COUNT(*) FROM hotel_features").fetchone()[0] == 5
+    await store.close()
+
+    with pytest.raises(ValueError):
+        SqliteStore(tmp_path / "bad.sqlite", write_batch_size=0)
+
+
+@pytest.mark.asyncio
+async def test_migrations_upgrade_legacy_rate_snapshots(tmp_path) -> None:
+    from secure_scraper.storage.sqlite_store import MIGRATIONS, SCHEMA_VERSION
+
+    db_path = tmp_path / "legacy.sqlite"
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        for version in range(1, 5):
+            conn.executescript(MIGRATIONS[version])
+        conn.execute("ALTER TABLE rate_snapshots ADD COLUMN raw_json TEXT")
+        conn.execute("INSERT INTO meta(key, value) VALUES('schema_version', '4')")
+        conn.commit()
+    finally:
+        conn.close()
+
+    store = SqliteStore(db_path)
+    await store.initialize()
+    conn = store._require_connection()
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(rate_snapshots)")}
+    version = conn.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone()[0]
+    user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    await store.close()
+
+    assert "raw_json" not in columns
+    assert int(version) == SCHEMA_VERSION
+    assert user_version == SCHEMA_VERSION
+
+
+@pytest.mark.asyncio
+async def test_save_rates_links_children_to_their_snapshots(tmp_path) -> None:
+    store = SqliteStore(tmp_path / "rates.sqlite", write_batch_size=2)
+    await store.initialize()
+    destination = Destination(
+        key="dest", group="Group", name="City", location_id="LOC", latitude=0.0, longitude=0.0
+    )
+    params = SearchParams(
+        location_id="LOC",
+        location_label="City",
+        latitude=0.0,
+        longitude=0.0,
+        check_in=date(2025, 3, 1),
+        check_out=date(2025, 3, 3),
+        rooms=[RoomRequest(adults=2)],
+    )
+    run_id = await store.begin_run(destination=destination, params=params, label=None)
+    await store.save_hotels(run_id, [{"property_id": "hotel-1", "summary": {}}])
+
+    def _rate(idx: int) -> dict:
+        return {
+            "property_id": "hotel-1",
+            "room_type_id": "room-1",
+            "rate_id": f"rate-{idx}",
+            "summary": {
+                "pricing": {
+                    "nightly_actual_rates": [float(idx), float(idx)],
+                    "fees": [{"type": f"FEE-{idx}", "value": idx}],
+                }
+            },
+            "search": {"check_in": "2025-03-01"},
+        }
+
+    await store.save_rates(run_id, [_rate(idx) for idx in range(5)])
+
+    conn = store._require_connection()
+    nightly = conn.execute(
+        """
+        SELECT rs.rate_id, rnp.actual_rate, rnp.night_date
+        FROM rate_nightly_prices rnp JOIN rate_snapshots rs ON rs.id = rnp.rate_snapshot_id
+        ORDER BY rs.rate_id, rnp.night_index
+        """
+    ).fetchall()
+    components = conn.execute(
+        """
+        SELECT rs.rate_id, rc.code
+        FROM rate_components rc JOIN rate_snapshots rs ON rs.id = rc.rate_snapshot_id
+        ORDER BY rs.rate_id
+        """
+    ).fetchall()
+    snapshot_ids_sql = "SELECT rate_id, id FROM rate_snapshots WHERE run_id=?"
+    first_ids = dict(conn.execute(snapshot_ids_sql, (run_id,)))
+
+    # Re-saving keeps surviving snapshots in place, drops vanished rates and rewrites children.
+    await store.save_rates(run_id, [_rate(idx) for idx in range(1, 6)])
+    second_ids = dict(conn.execute(snapshot_ids_sql, (run_id,)))
+    child_counts = conn.execute(
+        "SELECT (SELECT COUNT(*) FROM rate_nightly_prices), (SELECT COUNT(*) FROM rate_components)"
+    ).fetchone()
+    resaved_nightly = conn.execute(
+        """
+        SELECT rs.rate_id, MIN(rnp.actual_rate), MAX(rnp.actual_rate)
+        FROM rate_nightly_prices rnp JOIN rate_snapshots rs ON rs.id = rnp.rate_snapshot_id
+        GROUP BY rs.rate_id ORDER BY rs.rate_id
+        """
+    ).fetchall()
+    await store.close()
+
+    assert nightly == [
+        (f"rate-{idx}", float(idx), night)
+        for idx in range(5)
+        for night in ("2025-03-01", "2025-03-02")
+    ]
+    assert components == [(f"rate-{idx}", f"FEE-{idx}") for idx in range(5)]
+    assert sorted(second_ids) == [f"rate-{idx}" for idx in range(1, 6)]
+    assert all(second_ids[f"rate-{idx}"] == first_ids[f"rate-{idx}"] for idx in range(1, 5))
+    assert child_counts == (10, 5)
+    assert resaved_nightly == [(f"rate-{idx}", float(idx), float(idx)) for idx in range(1, 6)]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_in_memory() -> None:
+    from pathlib import Path
+
+    store = SqliteStore(Path(":memory:"))
+    await store.initialize()
+
+    destination = Destination(
+        key="mem", group="Group", name="City", location_id="LOC", latitude=0.0, longitude=0.0
+    )
+    params = SearchParams(
+        location_id="LOC",
+        location_label="City",
+        latitude=0.0,
+        longitude=0.0,
+        check_in=date(2025, 4, 1),
+        check_out=date(2025, 4, 2),
+        rooms=[RoomRequest(adults=1)],
+    )
+    run_id = await store.begin_run(destination=destination, params=params, label=None)
+    # Lookups must hit the writer's database, not a fresh in-memory one per reader.
+    latest = await store.fetch_latest_run(destination=destination, params=params, label=None)
+    await store.close()
+
+    assert latest is not None and latest.id == run_id
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_checkpoints_wal_when_idle(tmp_path, monkeypatch) -> None:
+    store = SqliteStore(tmp_path / "idle.sqlite", idle_checkpoint_seconds=0.01)
+    await store.initialize()
+    checkpoints: list[int] = []
+    original = store._checkpoint
+    monkeypatch.setattr(store, "_checkpoint", lambda: (checkpoints.append(1), original()))
+
+    await store.mark_runs_failed([999], "noop")
+    await store.mark_runs_failed([999], "noop")
+    await asyncio.sleep(0.1)
+    assert checkpoints == [1]
+
     await store.close()
+    assert store._checkpoint_handle is None